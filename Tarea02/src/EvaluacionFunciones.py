@@ -7,23 +7,24 @@ def sphere(x : np.array):
     '''
     if np.any(x < -5.12) or np.any(x>5.12):
         raise ValueError("Advertencia: algunos valores están fuera del rango [-5.12, 5.12]")
-    return np.sum(x**2.0)
+    return np.sum(x**2.0, axis=-1)
 
 def ackley(X : np.array, a=20, b=0.2, c=2*np.pi):
     '''
     Funcion Ackley definida:
         f(x) = a + e - a*exp(-b*sqrt(1/n * sum(x_i^2))) - exp(1/n * sum(cos(c*x_i)))
+    Como las demás funciones, acepta un vector o una matriz con un punto por renglón.
     '''
     if np.any(X < -30) or np.any(X > 30):
         raise ValueError("Advertencia: algunos valores están fuera del rango [-30, 30]")
 
-    n = len(X)
+    n = X.shape[-1]
 
     #Suma de cuadrados
-    sum_squares = np.sum(X**2.0)
+    sum_squares = np.sum(X**2.0, axis=-1)
 
     # Suma de cosenos
-    sum_cos = np.sum(np.cos(c * X))
+    sum_cos = np.sum(np.cos(c * X), axis=-1)
     term_1 = -a*np.exp(-b * np.sqrt(sum_squares/n))
     term_2 = -np.exp(sum_cos/n)
     return a + np.e + term_1 + term_2
@@ -32,13 +33,13 @@ def griewank(X : np.array):
     if np.any(X < -600) or np.any(X > 600):
         raise ValueError("Advertencia: algunos valores están fuera del rango [-600, 600]")
 
-    n = len(X)
-    sum_term = np.sum(X**2.0) / 4000.0
+    n = X.shape[-1]
+    sum_term = np.sum(X**2.0, axis=-1) / 4000.0
 
     # Producto
     indices = np.arange(1, n+1)
     cos_terms = np.cos(X / np.sqrt(indices))
-    prod_term = np.prod(cos_terms)
+    prod_term = np.prod(cos_terms, axis=-1)
 
     return 1 + sum_term + prod_term
 
@@ -46,13 +47,13 @@ def rastrigin(X : np.array):
     if np.any(X < -5.12) or np.any(X > 5.12):
         raise ValueError("Advertencia: algunos valores están fuera del rango [-5.12, 5.12]")
 
-    n = len(X)
-    sum_term = np.sum(X**2.0 - 10.0*np.cos(2.0 * np.pi * X))
+    n = X.shape[-1]
+    sum_term = np.sum(X**2.0 - 10.0*np.cos(2.0 * np.pi * X), axis=-1)
 
     return 10*n + sum_term
 
 def rosenbrock(X : np.array):
     if np.any(X < -2.048) or np.any(X > 2.048):
         raise ValueError("Advertencia: algunos valores están fuera del rango [-2.048, 2.048]")
-    sum_term = np.sum(100.0 * (X[1:] - X[:-1]**2.0)**2.0 + (1 - X[:-1])**2.0)
+    sum_term = np.sum(100.0 * (X[..., 1:] - X[..., :-1]**2.0)**2.0 + (1 - X[..., :-1])**2.0, axis=-1)
     return sum_term
@@ -1,11 +1,16 @@
 import sys
+import time
+import itertools
 import numpy as np
 import random
-from codificacion import decodifica_array
+from codificacion import decodifica_array, decodifica
 from EvaluacionFunciones import sphere, ackley, griewank, rastrigin, rosenbrock
+from perfilador import PerfiladorFases, ejecutar_con_cprofile
+
+FASES_BUSQUEDA = ('vecindad', 'evaluacion', 'seleccion')
 
 class BusquedaLocal:
-    def __init__(self, funcion_objetivo, dimension, bits_por_var, rango_min, rango_max):
+    def __init__(self, funcion_objetivo, dimension, bits_por_var, rango_min, rango_max, perfilador=None):
 
         self.funcion_objetivo = funcion_objetivo
         self.dimension = dimension
@@ -13,6 +18,7 @@ class BusquedaLocal:
         self.rango_min = rango_min
         self.rango_max = rango_max
         self.total_bits = dimension * bits_por_var
+        self.perfilador = perfilador            # PerfiladorFases opcional (modo --profile)
 
     def generar_solucion_aleatoria(self):
         return np.random.randint(0, 2, size=(self.dimension, self.bits_por_var))
@@ -57,29 +63,54 @@ class BusquedaLocal:
         Búsqueda por descenso - Mayor descenso.
         Explora TODOS los vecinos y elige el mejor.
         """
+        perf = self.perfilador
+        if perf is not None:
+            perf.iniciar()
+
         solucion_actual = self.generar_solucion_aleatoria()
         fitness_actual = self.evaluar_solucion(solucion_actual)
         evaluaciones = 1
+        iteraciones = 0
 
         for iteracion in range(max_iter):
+            iteraciones += 1
+            if perf is not None:
+                t0 = time.perf_counter_ns()
             vecinos = self.generar_vecindad(solucion_actual)
+            if perf is not None:
+                perf.registrar('vecindad', time.perf_counter_ns() - t0)
+
             mejor_vecino = None
             mejor_fitness = fitness_actual
 
             for vecino in vecinos:
+                # En modo perfil solo se mide una de cada `muestreo` evaluaciones
+                medir = perf is not None and perf.muestrear()
+                if medir:
+                    t1 = time.perf_counter_ns()
                 fitness_vecino = self.evaluar_solucion(vecino)
                 evaluaciones += 1
+                if medir:
+                    t2 = time.perf_counter_ns()
+                    perf.registrar('evaluacion', t2 - t1)
 
                 if fitness_vecino < mejor_fitness:
                     mejor_vecino = vecino
                     mejor_fitness = fitness_vecino
 
+                if medir:
+                    perf.registrar('seleccion', time.perf_counter_ns() - t2)
+
             if mejor_vecino is None:
                 break
 
             solucion_actual = mejor_vecino
             fitness_actual = mejor_fitness
 
+        if perf is not None:
+            perf.detener()
+            self._registrar_llamadas(iteraciones, evaluaciones)
+
         return solucion_actual, fitness_actual, evaluaciones
 
     def descenso_aleatorio(self, max_iter=1000):
@@ -87,22 +118,42 @@ class BusquedaLocal:
         Búsqueda por descenso - Descenso aleatorio.
         Explora vecinos aleatoriamente hasta encontrar mejora.
         """
+        perf = self.perfilador
+        if perf is not None:
+            perf.iniciar()
+
         solucion_actual = self.generar_solucion_aleatoria()
         fitness_actual = self.evaluar_solucion(solucion_actual)
         evaluaciones = 1
+        iteraciones = 0
 
         for iteracion in range(max_iter):
+            iteraciones += 1
+            if perf is not None:
+                t0 = time.perf_counter_ns()
             vecinos = self.generar_vecindad(solucion_actual)
             random.shuffle(vecinos)
+            if perf is not None:
+                perf.registrar('vecindad', time.perf_counter_ns() - t0)
 
             mejor_vecino = None
             mejor_fitness = fitness_actual
 
             for vecino in vecinos:
+                medir = perf is not None and perf.muestrear()
+                if medir:
+                    t1 = time.perf_counter_ns()
                 fitness_vecino = self.evaluar_solucion(vecino)
                 evaluaciones += 1
+                if medir:
+                    t2 = time.perf_counter_ns()
+                    perf.registrar('evaluacion', t2 - t1)
 
-                if fitness_vecino < fitness_actual:
+                mejora = fitness_vecino < fitness_actual
+                if medir:
+                    perf.registrar('seleccion', time.perf_counter_ns() - t2)
+
+                if mejora:
                     mejor_vecino = vecino
                     mejor_fitness = fitness_vecino
                     break
@@ -113,6 +164,10 @@ class BusquedaLocal:
             solucion_actual = mejor_vecino
             fitness_actual = mejor_fitness
 
+        if perf is not None:
+            perf.detener()
+            self._registrar_llamadas(iteraciones, evaluaciones)
+
         return solucion_actual, fitness_actual, evaluaciones
 
     def primer_descenso(self, max_iter=1000):
@@ -120,21 +175,41 @@ class BusquedaLocal:
         Búsqueda por descenso - Primer descenso.
         Toma el PRIMER vecino que sea mejor.
         """
+        perf = self.perfilador
+        if perf is not None:
+            perf.iniciar()
+
         solucion_actual = self.generar_solucion_aleatoria()
         fitness_actual = self.evaluar_solucion(solucion_actual)
         evaluaciones = 1
+        iteraciones = 0
 
         for iteracion in range(max_iter):
+            iteraciones += 1
+            if perf is not None:
+                t0 = time.perf_counter_ns()
             vecinos = self.generar_vecindad(solucion_actual)
+            if perf is not None:
+                perf.registrar('vecindad', time.perf_counter_ns() - t0)
 
             mejor_vecino = None
             mejor_fitness = fitness_actual
 
             for vecino in vecinos:
+                medir = perf is not None and perf.muestrear()
+                if medir:
+                    t1 = time.perf_counter_ns()
                 fitness_vecino = self.evaluar_solucion(vecino)
                 evaluaciones += 1
+                if medir:
+                    t2 = time.perf_counter_ns()
+                    perf.registrar('evaluacion', t2 - t1)
 
-                if fitness_vecino < fitness_actual:
+                mejora = fitness_vecino < fitness_actual
+                if medir:
+                    perf.registrar('seleccion', time.perf_counter_ns() - t2)
+
+                if mejora:
                     mejor_vecino = vecino
                     mejor_fitness = fitness_vecino
                     break
@@ -145,6 +220,361 @@ class BusquedaLocal:
             solucion_actual = mejor_vecino
             fitness_actual = mejor_fitness
 
+        if perf is not None:
+            perf.detener()
+            self._registrar_llamadas(iteraciones, evaluaciones)
+
+        return solucion_actual, fitness_actual, evaluaciones
+
+    def busqueda_tabu(self, max_iter=1000, max_evals=None, tenencia=None):
+        """
+        Búsqueda tabú sobre la vecindad de un bit.
+        En cada iteración se mueve al mejor vecino no tabú, aunque sea peor.
+        Un movimiento tabú se permite si mejora la mejor solución encontrada
+        (aspiración). Para cada bit se guarda la iteración en la que expira
+        su tenencia, así que revisar si un movimiento es tabú es O(1).
+        """
+        if tenencia is None:
+            tenencia = max(1, self.total_bits // 3)
+
+        perf = self.perfilador
+        if perf is not None:
+            perf.iniciar()
+
+        solucion_actual = self.generar_solucion_aleatoria()
+        fitness_actual = self.evaluar_solucion(solucion_actual)
+        evaluaciones = 1
+        iteraciones = 0
+
+        mejor_solucion = solucion_actual.copy()
+        mejor_fitness_global = fitness_actual
+
+        filas, cols = solucion_actual.shape
+        tabu_hasta = np.zeros((filas, cols), dtype=int)
+        agotado = False
+
+        for iteracion in range(max_iter):
+            iteraciones += 1
+            mejor_mov = None
+            mejor_fitness = np.inf
+            # Si todos los movimientos son tabú se toma el que expira primero
+            mov_menos_tabu = None
+            fitness_menos_tabu = np.inf
+
+            for k in range(filas * cols):
+                if max_evals is not None and evaluaciones >= max_evals:
+                    agotado = True
+                    break
+                i, j = divmod(k, cols)
+
+                medir = perf is not None and perf.muestrear()
+                if medir:
+                    t0 = time.perf_counter_ns()
+                # Flip en el lugar; se deshace después de evaluar
+                solucion_actual[i, j] = 1 - solucion_actual[i, j]
+                if medir:
+                    t1 = time.perf_counter_ns()
+                    perf.registrar('vecindad', t1 - t0)
+                fitness_vecino = self.evaluar_solucion(solucion_actual)
+                evaluaciones += 1
+                solucion_actual[i, j] = 1 - solucion_actual[i, j]
+                if medir:
+                    t2 = time.perf_counter_ns()
+                    perf.registrar('evaluacion', t2 - t1)
+
+                es_tabu = tabu_hasta[i, j] > iteracion
+                if es_tabu and not fitness_vecino < mejor_fitness_global:
+                    if mov_menos_tabu is None or tabu_hasta[i, j] < tabu_hasta[mov_menos_tabu]:
+                        mov_menos_tabu = (i, j)
+                        fitness_menos_tabu = fitness_vecino
+                elif fitness_vecino < mejor_fitness:
+                    mejor_mov = (i, j)
+                    mejor_fitness = fitness_vecino
+                if medir:
+                    perf.registrar('seleccion', time.perf_counter_ns() - t2)
+
+            if mejor_mov is None:
+                mejor_mov, mejor_fitness = mov_menos_tabu, fitness_menos_tabu
+            if mejor_mov is None:
+                break
+
+            i, j = mejor_mov
+            solucion_actual[i, j] = 1 - solucion_actual[i, j]
+            fitness_actual = mejor_fitness
+            tabu_hasta[i, j] = iteracion + 1 + tenencia
+
+            if fitness_actual < mejor_fitness_global:
+                mejor_solucion = solucion_actual.copy()
+                mejor_fitness_global = fitness_actual
+
+            if agotado:
+                break
+
+        if perf is not None:
+            perf.detener()
+            self._registrar_llamadas(iteraciones, evaluaciones, llamadas_vecindad=evaluaciones - 1)
+
+        return mejor_solucion, mejor_fitness_global, evaluaciones
+
+    def vecindad_hamming1(self):
+        # Todos los flips de un bit, en orden aleatorio
+        total = self.total_bits
+        for k in np.random.permutation(total):
+            yield (divmod(int(k), self.bits_por_var),)
+
+    def vecindad_hamming2(self, muestras):
+        """
+        Flips de dos bits distintos, generados de forma perezosa.
+        Si hay más de `muestras` pares posibles solo se muestrean `muestras`
+        pares al azar, sin construir el conjunto de O((d*b)^2) vecinos.
+        """
+        total = self.total_bits
+        if total * (total - 1) // 2 <= muestras:
+            for p, q in itertools.combinations(range(total), 2):
+                yield (divmod(p, self.bits_por_var), divmod(q, self.bits_por_var))
+        else:
+            for _ in range(muestras):
+                p, q = random.sample(range(total), 2)
+                yield (divmod(p, self.bits_por_var), divmod(q, self.bits_por_var))
+
+    def vecindad_k_bits(self, k, muestras):
+        # Flips de k bits dentro de una misma variable, muestreados
+        k = min(k, self.bits_por_var)
+        for _ in range(muestras):
+            i = random.randrange(self.dimension)
+            yield tuple((i, j) for j in random.sample(range(self.bits_por_var), k))
+
+    def _evaluar_movimiento(self, solucion, valores, movimiento):
+        """
+        Aplica el movimiento (lista de bits a voltear) sobre `solucion` en el lugar
+        y evalúa, decodificando solo las variables que cambiaron.
+        Regresa el fitness y los valores reales del vecino.
+        """
+        for i, j in movimiento:
+            solucion[i, j] = 1 - solucion[i, j]
+        x = valores.copy()
+        for i in {i for i, _ in movimiento}:
+            x[i] = decodifica(solucion[i, :].tolist(), self.bits_por_var,
+                              self.rango_min, self.rango_max)
+        return self.funcion_objetivo(x), x
+
+    def descenso_vnd(self, max_iter=1000, max_evals=None, muestras=None, k_bits_var=4):
+        """
+        Descenso por vecindades variables (VND).
+        Se busca con primer descenso en la vecindad de Hamming 1; solo cuando
+        se agota sin mejora se pasa a Hamming 2 (muestreada) y después a flips
+        de 3..k_bits_var bits dentro de una variable (k_bits_var=None los omite).
+        Al mejorar se regresa a la vecindad más pequeña. Cada exploración de
+        una vecindad cuenta como una iteración.
+        """
+        if muestras is None:
+            muestras = 5 * self.total_bits
+
+        vecindades = [self.vecindad_hamming1, lambda: self.vecindad_hamming2(muestras)]
+        if k_bits_var is not None:
+            for k in range(3, min(k_bits_var, self.bits_por_var) + 1):
+                vecindades.append(lambda k=k: self.vecindad_k_bits(k, muestras))
+
+        perf = self.perfilador
+        if perf is not None:
+            perf.iniciar()
+
+        solucion_actual = self.generar_solucion_aleatoria()
+        valores = np.array(self.mostrar_solucion(solucion_actual))
+        fitness_actual = self.funcion_objetivo(valores)
+        evaluaciones = 1
+        iteraciones = 0
+        nivel = 0
+
+        while nivel < len(vecindades) and iteraciones < max_iter:
+            iteraciones += 1
+            mejora = False
+
+            vecinos = vecindades[nivel]()
+            while True:
+                if max_evals is not None and evaluaciones >= max_evals:
+                    break
+
+                medir = perf is not None and perf.muestrear()
+                if medir:
+                    t0 = time.perf_counter_ns()
+                # La vecindad se genera de forma perezosa: cada next() produce un candidato
+                movimiento = next(vecinos, None)
+                if movimiento is None:
+                    break
+                if medir:
+                    tv = time.perf_counter_ns()
+                    perf.registrar('vecindad', tv - t0)
+                fitness_vecino, valores_vecino = self._evaluar_movimiento(solucion_actual, valores, movimiento)
+                evaluaciones += 1
+                if medir:
+                    t1 = time.perf_counter_ns()
+                    perf.registrar('evaluacion', t1 - tv)
+
+                if fitness_vecino < fitness_actual:
+                    fitness_actual = fitness_vecino
+                    valores = valores_vecino
+                    mejora = True
+                else:
+                    # Deshacer el movimiento
+                    for i, j in movimiento:
+                        solucion_actual[i, j] = 1 - solucion_actual[i, j]
+                if medir:
+                    perf.registrar('seleccion', time.perf_counter_ns() - t1)
+                if mejora:
+                    break
+
+            if max_evals is not None and evaluaciones >= max_evals:
+                break
+            nivel = 0 if mejora else nivel + 1
+
+        if perf is not None:
+            perf.detener()
+            self._registrar_llamadas(iteraciones, evaluaciones, llamadas_vecindad=evaluaciones - 1)
+
+        return solucion_actual, fitness_actual, evaluaciones
+
+    def _registrar_llamadas(self, iteraciones, evaluaciones, llamadas_vecindad=None):
+        # Conteos totales por fase, con los que se escalan los tiempos muestreados
+        perf = self.perfilador
+        if llamadas_vecindad is None:
+            llamadas_vecindad = iteraciones
+        perf.agregar_llamadas('vecindad', llamadas_vecindad)
+        perf.agregar_llamadas('evaluacion', evaluaciones - 1)
+        perf.agregar_llamadas('seleccion', evaluaciones - 1)
+        perf.contar('iteraciones', iteraciones)
+        perf.contar('propuestas', evaluaciones - 1)
+        perf.contar('evaluaciones', evaluaciones)
+
+
+class BusquedaLocalReal:
+    '''
+    Búsqueda local sobre vectores reales (float64) dentro de [rango_min, rango_max],
+    sin pasar por la codificación binaria. Las vecindades se generan como una
+    matriz con un vecino por renglón y se evalúan en una sola llamada a la
+    función objetivo.
+    '''
+    def __init__(self, funcion_objetivo, dimension, rango_min, rango_max, perfilador=None):
+
+        self.funcion_objetivo = funcion_objetivo
+        self.dimension = dimension
+        self.rango_min = rango_min
+        self.rango_max = rango_max
+        self.ancho = rango_max - rango_min
+        self.perfilador = perfilador            # PerfiladorFases opcional (modo --profile)
+
+    def generar_solucion_aleatoria(self):
+        return np.random.uniform(self.rango_min, self.rango_max, size=self.dimension)
+
+    def evaluar_solucion(self, x):
+        return self.funcion_objetivo(x)
+
+    def evaluar_vecinos(self, vecinos):
+        # Las funciones de prueba evalúan cada renglón de la matriz
+        return self.funcion_objetivo(vecinos)
+
+    def mostrar_solucion(self, x):
+        return x.tolist()
+
+    def busqueda_gaussiana(self, max_iter=1000, max_evals=None, num_vecinos=None,
+                           paso_inicial=0.1, paso_min=1e-8):
+        """
+        Búsqueda local con vecindad gaussiana.
+        En cada iteración se generan num_vecinos puntos x + sigma*N(0, I) y se
+        toma el mejor si mejora. sigma crece al mejorar y se reduce a la mitad
+        al fallar; la búsqueda termina cuando sigma < paso_min * ancho del dominio.
+        """
+        if num_vecinos is None:
+            num_vecinos = 2 * self.dimension
+
+        sigma = paso_inicial * self.ancho
+
+        def generar(x, k):
+            vecinos = x + sigma * np.random.standard_normal((k, self.dimension))
+            return np.clip(vecinos, self.rango_min, self.rango_max, out=vecinos)
+
+        def adaptar(mejora, i):
+            nonlocal sigma
+            sigma = sigma * 1.5 if mejora else sigma * 0.5
+            return sigma >= paso_min * self.ancho
+
+        return self._descenso_real(generar, adaptar, num_vecinos, max_iter, max_evals)
+
+    def busqueda_coordenadas(self, max_iter=1000, max_evals=None, paso_inicial=0.1, paso_min=1e-8):
+        """
+        Búsqueda por coordenadas con paso adaptativo.
+        La vecindad son los 2*d puntos x +/- paso_i * e_i. Si el mejor mejora,
+        el paso de esa coordenada se duplica; si ninguno mejora, todos los
+        pasos se reducen a la mitad.
+        """
+        pasos = np.full(self.dimension, paso_inicial * self.ancho)
+
+        def generar(x, k):
+            direcciones = np.concatenate([np.diag(pasos), -np.diag(pasos)])[:k]
+            vecinos = x + direcciones
+            return np.clip(vecinos, self.rango_min, self.rango_max, out=vecinos)
+
+        def adaptar(mejora, i):
+            if mejora:
+                pasos[i % self.dimension] *= 2.0
+            else:
+                pasos[:] *= 0.5
+            return pasos.max() >= paso_min * self.ancho
+
+        return self._descenso_real(generar, adaptar, 2 * self.dimension, max_iter, max_evals)
+
+    def _descenso_real(self, generar, adaptar, num_vecinos, max_iter, max_evals):
+        # Ciclo común: generar la vecindad, evaluarla en bloque y adaptar el paso
+        perf = self.perfilador
+        if perf is not None:
+            perf.iniciar()
+
+        solucion_actual = self.generar_solucion_aleatoria()
+        fitness_actual = self.evaluar_solucion(solucion_actual)
+        evaluaciones = 1
+        iteraciones = 0
+
+        for iteracion in range(max_iter):
+            k = num_vecinos
+            if max_evals is not None:
+                k = min(k, max_evals - evaluaciones)
+            if k <= 0:
+                break
+            iteraciones += 1
+
+            medir = perf is not None and perf.muestrear()
+            if medir:
+                t0 = time.perf_counter_ns()
+            vecinos = generar(solucion_actual, k)
+            if medir:
+                t1 = time.perf_counter_ns()
+            fitness_vecinos = self.evaluar_vecinos(vecinos)
+            evaluaciones += k
+            if medir:
+                t2 = time.perf_counter_ns()
+
+            i = int(np.argmin(fitness_vecinos))
+            mejora = fitness_vecinos[i] < fitness_actual
+            if mejora:
+                solucion_actual = vecinos[i].copy()
+                fitness_actual = fitness_vecinos[i]
+            continuar = adaptar(mejora, i)
+            if medir:
+                perf.registrar('vecindad', t1 - t0)
+                perf.registrar('evaluacion', t2 - t1)
+                perf.registrar('seleccion', time.perf_counter_ns() - t2)
+
+            if not continuar:
+                break
+
+        if perf is not None:
+            perf.detener()
+            for fase in FASES_BUSQUEDA:
+                perf.agregar_llamadas(fase, iteraciones)
+            perf.contar('iteraciones', iteraciones)
+            perf.contar('propuestas', evaluaciones - 1)
+            perf.contar('evaluaciones', evaluaciones)
+
         return solucion_actual, fitness_actual, evaluaciones
 
 
@@ -195,7 +625,7 @@ class FuncionesPrueba:
             raise ValueError(f"Función {n} no válida. Opciones: 1-5")
 
 
-def parse_arguments(args):
+def parse_arguments(args, real=False):
     if len(args) != 4:
         imprimir_uso()
         raise ValueError("Número incorrecto de argumentos")
@@ -206,35 +636,39 @@ def parse_arguments(args):
         b = int(args[2])
         i = int(args[3])
 
-        params = validar_parametros(n, d, b, i)
+        params = validar_parametros(n, d, b, i, real)
         print("Parámetros leídos desde línea de comandos:")
-        imprimir_parametros(params)
+        imprimir_parametros(params, real)
         return params
     except ValueError as e:
         print(f"Error al parsear argumentos: {e}")
         imprimir_uso()
         raise
 
-def validar_parametros(n, d, b, i):
+def validar_parametros(n, d, b, i, real=False):
     if not (1 <= n <= 5):
         raise ValueError("n debe estar entre 1 y 5")
     if d < 1:
         raise ValueError("d debe ser mayor que 0")
     if d > 100:
         print(f"Advertencia: dimensión {d} es muy alta, puede ser lenta")
-    if b < 1:
+    # Con --real no hay codificación binaria, así que b no se valida
+    if not real and b < 1:
         raise ValueError("b debe ser mayor que 0")
-    if b > 64:
+    if not real and b > 64:
         print(f"Advertencia: {b} bits es muy alto, puede causar problemas de precisión")
     if i < 1:
         raise ValueError("i debe ser mayor que 0")
     return {'n': n, 'd': d, 'b': b, 'i': i}
 
-def imprimir_parametros(params):
+def imprimir_parametros(params, real=False):
     func_info = FuncionesPrueba().get_function(params['n'])
     print(f"  Función (n): {params['n']} - {func_info['name']}")
     print(f"  Dimensión (d): {params['d']}")
-    print(f"  Bits (b): {params['b']}")
+    if real:
+        print(f"  Bits (b): se ignora (--real)")
+    else:
+        print(f"  Bits (b): {params['b']}")
     print(f"  Iteraciones (i): {params['i']}")
     print()
 
@@ -243,6 +677,11 @@ def imprimir_uso():
     print("  python src/busqueda_local.py              # Ejecución por defecto")
     print("  python src/busqueda_local.py n d b i      # Ejecutar con parámetros específicos")
     print()
+    print("Opciones (en cualquiera de las dos formas):")
+    print("  --real                  Búsqueda directa sobre vectores reales (b se ignora)")
+    print("  --profile               Mide el tiempo por fase e imprime un desglose por método")
+    print("  --prof-file RUTA.prof   Envuelve la ejecución en cProfile y guarda las estadísticas")
+    print()
     print("Donde:")
     print("  n = Función a evaluar (1-5)")
     print("  d = Dimensión del problema (entero positivo)")
@@ -250,161 +689,131 @@ def imprimir_uso():
     print("  i = Número máximo de iteraciones (entero positivo)")
     print()
 
-def ejecutar(params):
+def crear_busqueda(func_info, dimension, bits_por_var, real=False):
+    if real:
+        return BusquedaLocalReal(func_info['function'], dimension,
+                                 func_info['dom_min'], func_info['dom_max'])
+    return BusquedaLocal(func_info['function'], dimension, bits_por_var,
+                         func_info['dom_min'], func_info['dom_max'])
+
+def algoritmos_de(bl, sufijo=""):
+    if isinstance(bl, BusquedaLocalReal):
+        return [
+            (f"Búsqueda Gaussiana{sufijo}", bl.busqueda_gaussiana),
+            (f"Búsqueda por Coordenadas{sufijo}", bl.busqueda_coordenadas)
+        ]
+    return [
+        (f"Mayor Descenso{sufijo}", bl.mayor_descenso),
+        (f"Descenso Aleatorio{sufijo}", bl.descenso_aleatorio),
+        (f"Primer Descenso{sufijo}", bl.primer_descenso),
+        (f"Búsqueda Tabú{sufijo}", bl.busqueda_tabu),
+        (f"Descenso VND{sufijo}", bl.descenso_vnd)
+    ]
+
+def correr_algoritmos(bl, algoritmos, max_iter, perfilar=False):
+    for nombre, algoritmo in algoritmos:
+        print(f"\n {nombre}:")
+        if perfilar:
+            bl.perfilador = PerfiladorFases(FASES_BUSQUEDA)
+        inicio = time.perf_counter()
+        solucion, fitness, evals = algoritmo(max_iter=max_iter)
+        tiempo = time.perf_counter() - inicio
+        r = bl.mostrar_solucion(solucion)
+        print(f"   Valores: {[round(x, 3) for x in r]}")
+        print(f"   f(x) = {fitness:.6f}, Evaluaciones: {evals}, Tiempo: {tiempo:.3f}s")
+        if perfilar:
+            bl.perfilador.reporte(f"   Perfil {nombre}")
+
+def ejecutar(params, perfilar=False, real=False):
     prueba = FuncionesPrueba()
     func_info = prueba.get_function(params['n'])
 
-    bl = BusquedaLocal(func_info['function'], params['d'], params['b'], func_info['dom_min'], func_info['dom_max'])
+    bl = crear_busqueda(func_info, params['d'], params['b'], real)
 
-    print(f"Config: dim={params['d']}, bits={params['b']}")
+    if real:
+        print(f"Config: dim={params['d']}, representación real (float64)")
+    else:
+        print(f"Config: dim={params['d']}, bits={params['b']}")
 
     s_0= bl.generar_solucion_aleatoria()
 
-    print(f"Matriz de bits:\n{s_0}")
+    if not real:
+        print(f"Matriz de bits:\n{s_0}")
     v1 = bl.mostrar_solucion(s_0)
 
     print(f"Valores reales: {[round(x, 3) for x in v1]}")
     fitness = bl.evaluar_solucion(s_0)
     print(f"Fitness: {fitness:.6f}")
 
-    algoritmos = [
-        ("Mayor Descenso", bl.mayor_descenso),
-        ("Descenso Aleatorio", bl.descenso_aleatorio),
-        ("Primer Descenso", bl.primer_descenso)
-    ]
-
-
-    for nombre, algoritmo in algoritmos:
-        print(f"\n {nombre}:")
-        solucion, fitness, evals = algoritmo(max_iter=params['i'])
-        r1 = bl.mostrar_solucion(solucion)
-        print(f"   Valores: {[round(x, 3) for x in r1]}")
-        print(f"   f(x) = {fitness:.6f}, Evaluaciones: {evals}")
-
-def ejecucion_default():
-    dimension = 10
-    bits_por_var = 10
-    bl = BusquedaLocal(sphere, dimension, bits_por_var, -5.12, 5.12)
-    b2 = BusquedaLocal(ackley, dimension, bits_por_var, -30, 30)
-    b3 = BusquedaLocal(griewank, dimension, bits_por_var, -600, 600)
-    b4 = BusquedaLocal(rastrigin, dimension, bits_por_var, -5.12, 5.12)
-    b5 = BusquedaLocal(rosenbrock, dimension, bits_por_var, -2.048, 2.048)
-
-    print(f"Config: dim={dimension}, bits={bits_por_var}")
-
-    esfera = bl.generar_solucion_aleatoria()
-    akli = b2.generar_solucion_aleatoria()
-    grigan = b3.generar_solucion_aleatoria()
-    rastrin = b4.generar_solucion_aleatoria()
-    rosenbok = b5.generar_solucion_aleatoria()
-    ##########################################################################
-
-    print(f"Matriz de bits Sphere:\n{esfera}")
-    v1 = bl.mostrar_solucion(esfera)
-    print(f"Matriz de bits ackley :\n{akli}")
-    v2 = b2.mostrar_solucion(akli)
-    print(f"Matriz de bits griewank :\n{grigan}")
-    v3 = b3.mostrar_solucion(grigan)
-    print(f"Matriz de bits rastrigin :\n{rastrin}")
-    v4 = b4.mostrar_solucion(rastrin)
-    print(f"Matriz de bits rosenbrock :\n{rosenbok}")
-    v5 = b5.mostrar_solucion(rosenbok)
-
-    print(f"Valores reales Sphere : {[round(x, 3) for x in v1]}")
-    fitness = bl.evaluar_solucion(esfera)
-    print(f"Fitness: {fitness:.6f}")
-
-    print(f"Valores reales ackley: {[round(x, 3) for x in v2]}")
-    f1 = b2.evaluar_solucion(akli)
-    print(f"Fitness: {f1:.6f}")
-
-    print(f"Valores reales griewank: {[round(x, 3) for x in v3]}")
-    f2 = b3.evaluar_solucion(grigan)
-    print(f"Fitness: {f2:.6f}")
-
-    print(f"Valores reales rastrigin: {[round(x, 3) for x in v4]}")
-    f3 = b4.evaluar_solucion(rastrin)
-    print(f"Fitness: {f3:.6f}")
-
-    print(f"Valores reales rosenbrock: {[round(x, 3) for x in v5]}")
-    f4 = b5.evaluar_solucion(rosenbok)
-    print(f"Fitness: {f4:.6f}")
+    correr_algoritmos(bl, algoritmos_de(bl), params['i'], perfilar)
 
-    # Probar las 3 variantes
-    algoritmos = [
-        ("Mayor Descenso Esfera", bl.mayor_descenso),
-        ("Descenso Aleatorio Esfera", bl.descenso_aleatorio), 
-        ("Primer Descenso Esfera", bl.primer_descenso)
-    ]
-
-    for nombre, algoritmo in algoritmos:
-        print(f"\n {nombre}:")
-        solucion, fitness, evals = algoritmo(max_iter=50)
-        r1 = bl.mostrar_solucion(solucion)
-        print(f"   Valores: {[round(x, 3) for x in r1]}")
-        print(f"   f(x) = {fitness:.6f}, Evaluaciones: {evals}")
-
-    algoritmos2 = [
-        ("Mayor Descenso ackley", b2.mayor_descenso),
-        ("Descenso Aleatorio ackley", b2.descenso_aleatorio), 
-        ("Primer Descenso ackley", b2.primer_descenso)
-    ]
+def ejecucion_default(dimension=10, bits_por_var=10, max_iter=50, perfilar=False, real=False):
+    prueba = FuncionesPrueba()
+    busquedas = []
+    for n in sorted(prueba.functions):
+        func_info = prueba.get_function(n)
+        busquedas.append((func_info['name'], crear_busqueda(func_info, dimension, bits_por_var, real)))
 
-    for nombre, algoritmo in algoritmos2:
-        print(f"\n {nombre}:")
-        solucion, f1, evals = algoritmo(max_iter=50)
-        r2 = b2.mostrar_solucion(solucion)
-        print(f"   Valores: {[round(x, 3) for x in r2]}")
-        print(f"   f(x) = {f2:.6f}, Evaluaciones: {evals}")
-
-    algoritmos3 = [
-        ("Mayor Descenso griewank", b3.mayor_descenso),
-        ("Descenso Aleatorio griewank", b3.descenso_aleatorio), 
-        ("Primer Descenso griewank", b3.primer_descenso)
-    ]
+    if real:
+        print(f"Config: dim={dimension}, representación real (float64)")
+    else:
+        print(f"Config: dim={dimension}, bits={bits_por_var}")
 
-    for nombre, algoritmo in algoritmos3:
-        print(f"\n {nombre}:")
-        solucion, f2, evals = algoritmo(max_iter=50) 
-        r3 = b3.mostrar_solucion(solucion)
-        print(f"   Valores: {[round(x, 3) for x in r3]}")
-        print(f"   f(x) = {f2:.6f}, Evaluaciones: {evals}")
-
-    algoritmos4 = [
-        ("Mayor Descenso rastrigin", b4.mayor_descenso),
-        ("Descenso Aleatorio rastrigin", b4.descenso_aleatorio), 
-        ("Primer Descenso rastrigin", b4.primer_descenso)
-    ]
-
-    for nombre, algoritmo in algoritmos4:
-        print(f"\n {nombre}:")
-        solucion, f3, evals = algoritmo(max_iter=50) 
-        r4 = b4.mostrar_solucion(solucion)
-        print(f"   Valores: {[round(x, 3) for x in r4]}")
-        print(f"   f(x) = {f3:.6f}, Evaluaciones: {evals}")
-
-    algoritmos5 = [
-        ("Mayor Descenso rosenbrock", b5.mayor_descenso),
-        ("Descenso Aleatorio rosenbrock", b5.descenso_aleatorio), 
-        ("Primer Descenso rosenbrock", b5.primer_descenso)
-    ]
+    soluciones_iniciales = [(nombre, bl, bl.generar_solucion_aleatoria()) for nombre, bl in busquedas]
+    ##########################################################################
 
-    for nombre, algoritmo in algoritmos5:
-        print(f"\n {nombre}:")
-        solucion, f4, evals = algoritmo(max_iter=50)
-        r5 = b5.mostrar_solucion(solucion)
-        print(f"   Valores: {[round(x, 3) for x in r5]}")
-        print(f"   f(x) = {f4:.6f}, Evaluaciones: {evals}")
+    if not real:
+        for nombre, bl, s_0 in soluciones_iniciales:
+            print(f"Matriz de bits {nombre}:\n{s_0}")
+
+    for nombre, bl, s_0 in soluciones_iniciales:
+        v = bl.mostrar_solucion(s_0)
+        print(f"Valores reales {nombre}: {[round(x, 3) for x in v]}")
+        fitness = bl.evaluar_solucion(s_0)
+        print(f"Fitness: {fitness:.6f}")
+
+    # Probar los métodos con cada función
+    for nombre_funcion, bl in busquedas:
+        correr_algoritmos(bl, algoritmos_de(bl, f" {nombre_funcion}"), max_iter, perfilar)
+
+def extraer_opciones(args):
+    '''
+    Separa las opciones (--real, --profile, --prof-file RUTA)
+    de los argumentos posicionales n d b i.
+    '''
+    args = list(args)
+    opciones = {'perfilar': False, 'archivo_prof': None, 'real': False}
+    if '--real' in args:
+        args.remove('--real')
+        opciones['real'] = True
+    if '--profile' in args:
+        args.remove('--profile')
+        opciones['perfilar'] = True
+    if '--prof-file' in args:
+        i = args.index('--prof-file')
+        if i + 1 >= len(args):
+            imprimir_uso()
+            raise ValueError("--prof-file requiere la ruta del archivo .prof")
+        opciones['archivo_prof'] = args[i + 1]
+        del args[i:i + 2]
+    return args, opciones
 
 def main():
     try:
-        if len(sys.argv) <= 1:  # Ejecución por defecto
-            ejecucion_default()
+        args, opciones = extraer_opciones(sys.argv[1:])
+        if len(args) == 0:  # Ejecución por defecto
+            funcion, argumentos = ejecucion_default, ()
         else:
 
             # Parsear argumentos de línea de comandos
-            params = parse_arguments(sys.argv[1:])
-            ejecutar(params)
+            params = parse_arguments(args, opciones['real'])
+            funcion, argumentos = ejecutar, (params,)
+
+        if opciones['archivo_prof'] is not None:
+            ejecutar_con_cprofile(opciones['archivo_prof'], funcion, *argumentos,
+                                  perfilar=opciones['perfilar'], real=opciones['real'])
+        else:
+            funcion(*argumentos, perfilar=opciones['perfilar'], real=opciones['real'])
 
     except Exception as e:
         print(f"Error en la ejecución: {e}")
@@ -0,0 +1,247 @@
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from busqueda_local import FuncionesPrueba, crear_busqueda
+
+# Métodos de búsqueda disponibles: nombre en la malla -> método de BusquedaLocal
+METODOS = {
+    'mayor': 'mayor_descenso',
+    'aleatorio': 'descenso_aleatorio',
+    'primer': 'primer_descenso',
+    'tabu': 'busqueda_tabu',
+    'vnd': 'descenso_vnd',
+}
+
+# Métodos sobre vectores reales (BusquedaLocalReal); en sus celdas se ignoran los bits
+METODOS_REALES = {
+    'gauss': 'busqueda_gaussiana',
+    'coordenadas': 'busqueda_coordenadas',
+}
+
+# Valor de b registrado en las celdas de METODOS_REALES, que no usan bits
+BITS_REALES = 0
+
+# Malla por defecto: equivalente a la ejecución por defecto de busqueda_local.py
+MALLA_DEFAULT = {
+    'funciones': [1, 2, 3, 4, 5],
+    'dimensiones': [10],
+    'bits': [10],
+    'metodos': ['mayor', 'aleatorio', 'primer', 'tabu', 'vnd'],
+    'semillas': list(range(10)),
+    'max_iter': 50,
+}
+
+CAMPOS_CELDA = ('n', 'd', 'b', 'metodo', 'semilla', 'max_iter')
+
+
+def cargar_malla(ruta):
+    '''
+    Lee la especificación de la malla desde un archivo JSON.
+    Las llaves omitidas toman el valor de MALLA_DEFAULT.
+    '''
+    malla = dict(MALLA_DEFAULT)
+    if ruta is not None:
+        with open(ruta, 'r') as f:
+            malla.update(json.load(f))
+
+    for n in malla['funciones']:
+        FuncionesPrueba().get_function(n)
+    for metodo in malla['metodos']:
+        if metodo not in METODOS and metodo not in METODOS_REALES:
+            opciones = ', '.join(list(METODOS) + list(METODOS_REALES))
+            raise ValueError(f"Método {metodo} no válido. Opciones: {opciones}")
+    if isinstance(malla['semillas'], int):
+        malla['semillas'] = list(range(malla['semillas']))
+    return malla
+
+
+def generar_celdas(malla):
+    celdas = []
+    vistas = set()
+    for n, d, b, metodo, semilla in itertools.product(malla['funciones'], malla['dimensiones'],
+                                                       malla['bits'], malla['metodos'],
+                                                       malla['semillas']):
+        # Los métodos reales no usan b: una sola celda con b=BITS_REALES en lugar de una por cada b
+        if metodo in METODOS_REALES:
+            b = BITS_REALES
+        celda = {'n': n, 'd': d, 'b': b, 'metodo': metodo,
+                 'semilla': semilla, 'max_iter': malla['max_iter']}
+        if llave_celda(celda) not in vistas:
+            vistas.add(llave_celda(celda))
+            celdas.append(celda)
+    return celdas
+
+
+def llave_celda(celda):
+    return tuple(celda[campo] for campo in CAMPOS_CELDA)
+
+
+def ejecutar_celda(celda):
+    '''
+    Ejecuta una sola celda de la malla. Se llama dentro de un proceso del pool,
+    por lo que se fijan ambas semillas (numpy y random) antes de buscar.
+    '''
+    func_info = FuncionesPrueba().get_function(celda['n'])
+    real = celda['metodo'] in METODOS_REALES
+    bl = crear_busqueda(func_info, celda['d'], celda['b'], real)
+
+    np.random.seed(celda['semilla'])
+    random.seed(celda['semilla'])
+
+    algoritmo = getattr(bl, METODOS_REALES[celda['metodo']] if real else METODOS[celda['metodo']])
+    inicio = time.perf_counter()
+    _, fitness, evaluaciones = algoritmo(max_iter=celda['max_iter'])
+    tiempo = time.perf_counter() - inicio
+
+    resultado = dict(celda)
+    resultado.update({
+        'funcion': func_info['name'],
+        'mejor_f': float(fitness),
+        'evaluaciones': int(evaluaciones),
+        'tiempo': tiempo,
+    })
+    return resultado
+
+
+def leer_resultados(ruta):
+    '''
+    Lee el almacén de resultados (una línea JSON por celda).
+    Una última línea incompleta (proceso interrumpido a media escritura) se ignora.
+    '''
+    resultados = []
+    if not os.path.exists(ruta):
+        return resultados
+    with open(ruta, 'r') as f:
+        for linea in f:
+            linea = linea.strip()
+            if not linea:
+                continue
+            try:
+                resultados.append(json.loads(linea))
+            except json.JSONDecodeError:
+                continue
+    return resultados
+
+
+def terminar_linea(ruta):
+    '''
+    Si el almacén quedó con una última línea incompleta (proceso interrumpido
+    a media escritura), le agrega el salto de línea que falta para que el
+    siguiente resultado empiece en una línea propia.
+    '''
+    if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+        return
+    with open(ruta, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b"\n":
+            f.write(b"\n")
+
+
+def guardar_resultado(f, resultado):
+    f.write(json.dumps(resultado) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def ejecutar_malla(malla, ruta_resultados, procesos=None):
+    '''
+    Ejecuta todas las celdas pendientes de la malla en un pool de procesos.
+    Cada resultado se agrega al almacén en cuanto termina, así que al reiniciar
+    se omiten las celdas ya completadas.
+    '''
+    celdas = generar_celdas(malla)
+    completadas = {llave_celda(r) for r in leer_resultados(ruta_resultados)}
+    pendientes = [c for c in celdas if llave_celda(c) not in completadas]
+
+    print(f"Celdas: {len(celdas)}, completadas: {len(celdas) - len(pendientes)}, pendientes: {len(pendientes)}")
+    if not pendientes:
+        return
+
+    terminar_linea(ruta_resultados)
+    with open(ruta_resultados, 'a') as f, ProcessPoolExecutor(max_workers=procesos) as pool:
+        futuros = {pool.submit(ejecutar_celda, celda): celda for celda in pendientes}
+        for i, futuro in enumerate(as_completed(futuros), start=1):
+            resultado = futuro.result()
+            guardar_resultado(f, resultado)
+            print(f"[{i}/{len(pendientes)}] {resultado['funcion']} d={resultado['d']} b={resultado['b']} "
+                  f"{resultado['metodo']} semilla={resultado['semilla']}: "
+                  f"f={resultado['mejor_f']:.6f}, evals={resultado['evaluaciones']}, "
+                  f"t={resultado['tiempo']:.3f}s")
+
+
+def resumen(resultados):
+    '''
+    Agrupa los resultados por configuración (función, d, b, método, max_iter)
+    y calcula mediana e IQR de la mejor f, evaluaciones y tiempo.
+    '''
+    grupos = {}
+    for r in resultados:
+        llave = (r['n'], r['d'], r['b'], r['metodo'], r['max_iter'])
+        grupos.setdefault(llave, []).append(r)
+
+    filas = []
+    for llave in sorted(grupos):
+        grupo = grupos[llave]
+        f_vals = np.array([r['mejor_f'] for r in grupo])
+        evals = np.array([r['evaluaciones'] for r in grupo])
+        tiempos = np.array([r['tiempo'] for r in grupo])
+        q1, mediana, q3 = np.percentile(f_vals, [25, 50, 75])
+        filas.append({
+            'funcion': grupo[0]['funcion'],
+            'd': llave[1],
+            'b': llave[2],
+            'metodo': llave[3],
+            'corridas': len(grupo),
+            'mediana_f': mediana,
+            'iqr_f': q3 - q1,
+            'mediana_evals': float(np.median(evals)),
+            'mediana_tiempo': float(np.median(tiempos)),
+        })
+    return filas
+
+
+def imprimir_resumen(filas):
+    encabezado = (f"{'Función':<11} {'d':>4} {'b':>4} {'Método':<12} {'Runs':>5} "
+                  f"{'Mediana f':>14} {'IQR f':>12} {'Med. evals':>11} {'Med. t(s)':>10}")
+    print(encabezado)
+    print("-" * len(encabezado))
+    for fila in filas:
+        print(f"{fila['funcion']:<11} {fila['d']:>4} {fila['b']:>4} {fila['metodo']:<12} "
+              f"{fila['corridas']:>5} {fila['mediana_f']:>14.6f} {fila['iqr_f']:>12.6f} "
+              f"{fila['mediana_evals']:>11.0f} {fila['mediana_tiempo']:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Malla de experimentos para la búsqueda local")
+    parser.add_argument('malla', nargs='?', default=None,
+                        help="archivo JSON con la especificación de la malla (opcional)")
+    parser.add_argument('-o', '--salida', default='resultados_experimentos.jsonl',
+                        help="almacén de resultados (una línea JSON por celda)")
+    parser.add_argument('-j', '--procesos', type=int, default=None,
+                        help="número de procesos del pool (por defecto, núm. de CPUs)")
+    parser.add_argument('--solo-resumen', action='store_true',
+                        help="no ejecuta celdas, solo imprime el resumen del almacén")
+    args = parser.parse_args()
+
+    try:
+        malla = cargar_malla(args.malla)
+        if not args.solo_resumen:
+            ejecutar_malla(malla, args.salida, args.procesos)
+        print()
+        imprimir_resumen(resumen(leer_resultados(args.salida)))
+    except Exception as e:
+        print(f"Error en la ejecución: {e}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = main()
+    sys.exit(exit_code)
@@ -0,0 +1,75 @@
+import time
+import cProfile
+
+class PerfiladorFases:
+    '''
+    Temporizadores por fase para los métodos de BusquedaLocal.
+    Cada fase se mide con perf_counter_ns solo en una de cada `muestreo`
+    llamadas; el tiempo total se estima con el promedio de las muestras
+    multiplicado por el número de llamadas de la fase.
+    '''
+    def __init__(self, fases, muestreo=16):
+        self.fases = list(fases)
+        self.muestreo = muestreo
+        self.ns_muestreados = dict.fromkeys(self.fases, 0)
+        self.muestras = dict.fromkeys(self.fases, 0)
+        self.llamadas = dict.fromkeys(self.fases, 0)
+        self.contadores = {}
+        self._tick = 0
+        self._inicio_ns = None
+        self.total_ns = 0
+
+    def iniciar(self):
+        self._inicio_ns = time.perf_counter_ns()
+
+    def detener(self):
+        self.total_ns += time.perf_counter_ns() - self._inicio_ns
+        self._inicio_ns = None
+
+    def muestrear(self):
+        # Indica si la llamada actual se mide
+        self._tick += 1
+        return self._tick % self.muestreo == 0
+
+    def registrar(self, fase, ns):
+        self.ns_muestreados[fase] += ns
+        self.muestras[fase] += 1
+
+    def agregar_llamadas(self, fase, n):
+        self.llamadas[fase] += n
+
+    def contar(self, contador, n=1):
+        self.contadores[contador] = self.contadores.get(contador, 0) + n
+
+    def tiempo_estimado(self, fase):
+        if self.muestras[fase] == 0:
+            return 0.0
+        return self.ns_muestreados[fase] / self.muestras[fase] * self.llamadas[fase]
+
+    def reporte(self, titulo="Perfil"):
+        total_s = self.total_ns / 1e9
+        estimados = {fase: self.tiempo_estimado(fase) for fase in self.fases}
+        suma_ns = sum(estimados.values())
+
+        print(f"\n{titulo} (muestreo 1/{self.muestreo}, tiempo total {total_s:.3f}s)")
+        for contador, valor in self.contadores.items():
+            tasa = valor / total_s if total_s > 0 else 0.0
+            print(f"  {contador}: {valor} ({tasa:,.0f}/s)")
+
+        encabezado = f"  {'Fase':<12} {'Llamadas':>10} {'Tiempo est.(s)':>15} {'ns/llamada':>11} {'% tiempo':>9}"
+        print(encabezado)
+        print("  " + "-" * (len(encabezado) - 2))
+        for fase in self.fases:
+            por_llamada = estimados[fase] / self.llamadas[fase] if self.llamadas[fase] else 0.0
+            porcentaje = 100.0 * estimados[fase] / suma_ns if suma_ns > 0 else 0.0
+            print(f"  {fase:<12} {self.llamadas[fase]:>10} {estimados[fase] / 1e9:>15.3f} "
+                  f"{por_llamada:>11.0f} {porcentaje:>8.1f}%")
+
+def ejecutar_con_cprofile(archivo_prof, funcion, *args, **kwargs):
+    # Envuelve la llamada en cProfile y guarda las estadísticas en archivo_prof
+    perfil = cProfile.Profile()
+    try:
+        return perfil.runcall(funcion, *args, **kwargs)
+    finally:
+        perfil.dump_stats(archivo_prof)
+        print(f"Perfil de cProfile guardado en: {archivo_prof}")
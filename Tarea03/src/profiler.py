@@ -0,0 +1,75 @@
+import time
+import cProfile
+
+class PhaseProfiler:
+    '''
+    Temporizadores por fase de bajo costo para el ciclo de recocido.
+    Solo se mide con perf_counter_ns una de cada `sample_every` iteraciones;
+    el tiempo total de cada fase se estima escalando el promedio muestreado
+    por el número total de veces que se ejecutó la fase.
+    '''
+    def __init__(self, phases, sample_every=16):
+        self.phases = list(phases)
+        self.sample_every = sample_every
+        self.sampled_ns = dict.fromkeys(self.phases, 0)
+        self.sampled_calls = dict.fromkeys(self.phases, 0)
+        self.calls = dict.fromkeys(self.phases, 0)
+        self.counters = {}
+        self._tick = 0
+        self._start_ns = None
+        self.wall_ns = 0
+
+    def start(self):
+        self._start_ns = time.perf_counter_ns()
+
+    def stop(self):
+        self.wall_ns += time.perf_counter_ns() - self._start_ns
+        self._start_ns = None
+
+    def sample(self):
+        # Decide si la iteración actual se mide
+        self._tick += 1
+        return self._tick % self.sample_every == 0
+
+    def record(self, phase, elapsed_ns):
+        self.sampled_ns[phase] += elapsed_ns
+        self.sampled_calls[phase] += 1
+
+    def add_calls(self, phase, n):
+        self.calls[phase] += n
+
+    def count(self, counter, n=1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def estimated_ns(self, phase):
+        if self.sampled_calls[phase] == 0:
+            return 0.0
+        return self.sampled_ns[phase] / self.sampled_calls[phase] * self.calls[phase]
+
+    def report(self, title="Perfil"):
+        wall_s = self.wall_ns / 1e9
+        estimated = {phase: self.estimated_ns(phase) for phase in self.phases}
+        total_ns = sum(estimated.values())
+
+        print(f"\n{title} (muestreo 1/{self.sample_every}, tiempo total {wall_s:.3f}s)")
+        for counter, value in self.counters.items():
+            rate = value / wall_s if wall_s > 0 else 0.0
+            print(f"  {counter}: {value} ({rate:,.0f}/s)")
+
+        header = f"  {'Fase':<14} {'Llamadas':>10} {'Tiempo est.(s)':>15} {'ns/llamada':>11} {'% tiempo':>9}"
+        print(header)
+        print("  " + "-" * (len(header) - 2))
+        for phase in self.phases:
+            per_call = estimated[phase] / self.calls[phase] if self.calls[phase] else 0.0
+            share = 100.0 * estimated[phase] / total_ns if total_ns > 0 else 0.0
+            print(f"  {phase:<14} {self.calls[phase]:>10} {estimated[phase] / 1e9:>15.3f} "
+                  f"{per_call:>11.0f} {share:>8.1f}%")
+
+def run_with_cprofile(prof_file, func, *args, **kwargs):
+    # Envuelve la llamada en cProfile y guarda las estadísticas en prof_file
+    profile = cProfile.Profile()
+    try:
+        return profile.runcall(func, *args, **kwargs)
+    finally:
+        profile.dump_stats(prof_file)
+        print(f"Perfil de cProfile guardado en: {prof_file}")
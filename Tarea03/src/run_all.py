@@ -1,5 +1,11 @@
 import os
+import re
+import math
+import shutil
+import argparse
+import statistics
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 
 ejemplares = [
     "Ejemplares/David_Filmer1.txt",
@@ -12,22 +18,155 @@ ejemplares = [
 metodos = ['g', 's', 'l']  # geometric, slow, linear
 repeticiones = 10
 output_file = "resultados.txt"
+checkpoint_dir = "checkpoints"            # Estado de corridas sin terminar y resultados parciales
+checkpoint_interval = 10000
 
-with open(output_file, 'w') as f:
-    for ejemplar in ejemplares:
-        for metodo in metodos:
-            f.write(f"Ejemplar: {os.path.basename(ejemplar)}, Método: {metodo}\n")
-            for i in range(repeticiones):
-                # Ejecuta el sudoku.py con el ejemplar y método de enfriamiento
-                result = subprocess.run(
-                    ["python3", "sudoku.py", ejemplar, metodo],
-                    capture_output=True, text=True
-                )
-
-                # Extrae solo fitness final y número de iteraciones
-                lines = result.stdout.splitlines()
-                fitness_line = next((l for l in lines if "Fitness final" in l), "Fitness final: N/A")
-                iterations_line = next((l for l in lines if "Iteraciones" in l), "Iteraciones: N/A")
-
-                f.write(f"Repetición {i+1}: {fitness_line}, {iterations_line}\n")
-            f.write("\n")
+# Valores críticos de la t de Student (dos colas, 95%) por grados de libertad
+T_CRITICO_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+                8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 30: 2.042}
+
+def ejecutar_repeticion(ejemplar, metodo, i):
+    nombre = f"{os.path.splitext(os.path.basename(ejemplar))[0]}_{metodo}_{i+1}"
+    checkpoint_file = os.path.join(checkpoint_dir, nombre + ".ckpt")
+    done_file = os.path.join(checkpoint_dir, nombre + ".done")
+
+    # Repetición ya terminada en una ejecución anterior
+    if os.path.exists(done_file):
+        with open(done_file, 'r') as f:
+            return f.read().strip()
+
+    # Si hay checkpoint, la repetición quedó a medias: se reanuda
+    if os.path.exists(checkpoint_file):
+        comando = ["python3", "sudoku.py", "--reanudar", checkpoint_file]
+    else:
+        comando = ["python3", "sudoku.py", ejemplar, metodo, "--checkpoint", checkpoint_file]
+    comando += ["--intervalo", str(checkpoint_interval)]
+
+    # Ejecuta el sudoku.py con el ejemplar y método de enfriamiento
+    result = subprocess.run(comando, capture_output=True, text=True)
+
+    # Extrae solo fitness final y número de iteraciones
+    lines = result.stdout.splitlines()
+    fitness_line = next((l for l in lines if "Fitness final" in l), "Fitness final: N/A")
+    iterations_line = next((l for l in lines if "Iteraciones" in l), "Iteraciones: N/A")
+    linea = f"{fitness_line}, {iterations_line}"
+
+    if result.returncode == 0:
+        tmp_file = done_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            f.write(linea + "\n")
+        os.replace(tmp_file, done_file)
+    return linea
+
+def extraer_fitness(linea):
+    match = re.search(r"Fitness final: ([0-9.]+)", linea)
+    return float(match.group(1)) if match else None
+
+def intervalo_confianza(valores):
+    # Media e intervalo de confianza al 95% (t de Student)
+    n = len(valores)
+    media = statistics.mean(valores)
+    if n < 2:
+        return media, -math.inf, math.inf
+    gl = n - 1
+    t = T_CRITICO_95[max(k for k in T_CRITICO_95 if k <= gl)] if gl <= 30 else 1.96
+    semiancho = t * statistics.stdev(valores) / math.sqrt(n)
+    return media, media - semiancho, media + semiancho
+
+def escribir_resumen(f, lineas):
+    valores = [v for v in (extraer_fitness(l) for l in lineas) if v is not None]
+    if not valores:
+        f.write("Resumen: sin resultados válidos\n")
+        return
+    f.write(f"Resumen: repeticiones={len(valores)}, promedio={statistics.mean(valores):.2f}, "
+            f"mediana={statistics.median(valores):.2f}, mínimo={min(valores):.1f}, máximo={max(valores):.1f}\n")
+
+def correr_fijo(pool, ejemplar):
+    # Todas las repeticiones de todos los métodos, sin eliminación
+    futuros = {(metodo, i): pool.submit(ejecutar_repeticion, ejemplar, metodo, i)
+               for metodo in metodos for i in range(repeticiones)}
+    return {metodo: [futuros[(metodo, i)].result() for i in range(repeticiones)] for metodo in metodos}, {}
+
+def correr_racing(pool, ejemplar, ronda, min_reps, tolerancia):
+    '''
+    Racing de métodos de enfriamiento. En cada ronda se corren `ronda`
+    repeticiones de cada método vivo en paralelo. A partir de `min_reps`
+    repeticiones se elimina todo método cuyo intervalo de confianza queda
+    completamente por encima del intervalo del mejor método (fitness más
+    bajo es mejor). La carrera termina al llegar a `repeticiones` o cuando el
+    semiancho del intervalo de todos los métodos vivos es menor a `tolerancia`.
+    '''
+    vivos = list(metodos)
+    lineas = {metodo: [] for metodo in metodos}
+    eliminados = {}
+    n = 0
+
+    while n < repeticiones:
+        tam = min(ronda, repeticiones - n)
+        futuros = {(metodo, i): pool.submit(ejecutar_repeticion, ejemplar, metodo, i)
+                   for metodo in vivos for i in range(n, n + tam)}
+        for metodo in vivos:
+            lineas[metodo] += [futuros[(metodo, i)].result() for i in range(n, n + tam)]
+        n += tam
+        if n < min_reps:
+            continue
+
+        stats = {}
+        for metodo in vivos:
+            valores = [v for v in (extraer_fitness(l) for l in lineas[metodo]) if v is not None]
+            if valores:
+                stats[metodo] = intervalo_confianza(valores)
+        if not stats:
+            continue
+
+        mejor = min(stats, key=lambda m: stats[m][0])
+        for metodo in list(vivos):
+            if metodo != mejor and metodo in stats and stats[metodo][1] > stats[mejor][2]:
+                vivos.remove(metodo)
+                eliminados[metodo] = n
+
+        estables = all(metodo in stats and (stats[metodo][2] - stats[metodo][1]) / 2 <= tolerancia
+                       for metodo in vivos)
+        if estables:
+            break
+
+    return lineas, eliminados
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta todos los ejemplares con cada método de enfriamiento")
+    parser.add_argument('--racing', action='store_true',
+                        help="elimina métodos claramente peores y se detiene cuando las estimaciones son estables")
+    parser.add_argument('--paralelo', type=int, default=1,
+                        help="repeticiones ejecutadas al mismo tiempo (por defecto 1)")
+    parser.add_argument('--ronda', type=int, default=2,
+                        help="repeticiones por método en cada ronda del racing (por defecto 2)")
+    parser.add_argument('--min-reps', type=int, default=4,
+                        help="repeticiones mínimas antes de eliminar métodos (por defecto 4)")
+    parser.add_argument('--tolerancia', type=float, default=0.5,
+                        help="semiancho del intervalo de confianza para considerar estable un método")
+    args = parser.parse_args()
+
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+    with open(output_file, 'w') as f, ThreadPoolExecutor(max_workers=args.paralelo) as pool:
+        for ejemplar in ejemplares:
+            if args.racing:
+                lineas, eliminados = correr_racing(pool, ejemplar, args.ronda, args.min_reps, args.tolerancia)
+            else:
+                lineas, eliminados = correr_fijo(pool, ejemplar)
+
+            for metodo in metodos:
+                f.write(f"Ejemplar: {os.path.basename(ejemplar)}, Método: {metodo}\n")
+                for i, linea in enumerate(lineas[metodo]):
+                    f.write(f"Repetición {i+1}: {linea}\n")
+                if metodo in eliminados:
+                    f.write(f"Eliminado por racing tras {eliminados[metodo]} repeticiones\n")
+                escribir_resumen(f, lineas[metodo])
+                f.write("\n")
+            f.flush()
+
+    # Todas las repeticiones terminaron, ya no hace falta el estado parcial
+    shutil.rmtree(checkpoint_dir)
+
+if __name__ == "__main__":
+    main()
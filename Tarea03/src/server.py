@@ -0,0 +1,280 @@
+import asyncio
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from sudoku import Sudoku, SudokuSolution, solve_sudoku, NEIGHBORHOODS
+from solution_cache import SolutionCache
+
+COOLING_METHODS = ('g', 's', 'l')
+DEFAULT_BUDGET = 250000
+
+# Servidor de resolución con un pool de procesos ya inicializados.
+# Protocolo: JSON-lines, una petición por línea y una respuesta por línea.
+#
+#   {"id": 1, "puzzle": "52...", "cooling": "s", "budget": 100000}
+#   {"id": 2, "grid": [[0, 5, 2, ...], ...], "cooling": "g", "neighborhood": "conflicts"}
+#
+# Las respuestas salen en el orden en que terminan (no en el de llegada),
+# por eso siempre incluyen el "id" de la petición.
+
+_cache = None           # SolutionCache del proceso, si el servidor se inició con --cache
+
+def _warm_worker(cache_path=None, cache_max=10000):
+    # Se ejecuta una vez por proceso: deja importado el módulo y ejercita el
+    # evaluador, así la primera petición real no paga el arranque
+    global _cache
+    problem = Sudoku([[0] * 4 for _ in range(4)])
+    SudokuSolution(problem).evaluate()
+    # Cada proceso abre su propia conexión; SQLite coordina la escritura
+    if cache_path is not None:
+        _cache = SolutionCache(cache_path, max_entries=cache_max)
+
+def _ping():
+    return os.getpid()
+
+def _solve_job(grid, cooling, budget, neighborhood):
+    start = time.perf_counter()
+    problem = Sudoku(grid)
+    solution, fitness, cached = solve_sudoku(problem, cooling_method=cooling, max_iteration=budget, verbose=False,
+                                             neighborhood=neighborhood, cache=_cache)
+    solve_time = time.perf_counter() - start
+    return solution.get_grid().tolist(), float(fitness), solve_time, cached
+
+def parse_request(request):
+    '''
+    Valida una petición y regresa (grid, cooling, budget, neighborhood, como_cadena).
+    como_cadena indica si la solución se responde en el mismo formato de 81 caracteres.
+    '''
+    if 'puzzle' in request:
+        problem = Sudoku.from_string(request['puzzle'])
+        as_string = True
+    elif 'grid' in request:
+        problem = Sudoku(request['grid'])
+        as_string = False
+    else:
+        raise ValueError("Se esperaba 'puzzle' (cadena) o 'grid' (matriz)")
+
+    if problem.grid.ndim != 2 or problem.grid.shape[1] != problem.size:
+        raise ValueError("El tablero debe ser una matriz cuadrada")
+    # Valores fuera de 0..n harían que los procesos trabajen con un tablero imposible
+    if problem.grid.min() < 0 or problem.grid.max() > problem.size:
+        raise ValueError(f"Los valores de un tablero de {problem.size}x{problem.size} deben estar entre 0 y {problem.size}")
+
+    cooling = request.get('cooling', 's')
+    if cooling not in COOLING_METHODS:
+        raise ValueError(f"Método de enfriamiento '{cooling}' no válido. Opciones: {', '.join(COOLING_METHODS)}")
+
+    budget = int(request.get('budget', DEFAULT_BUDGET))
+    if budget < 1:
+        raise ValueError("budget debe ser mayor que 0")
+
+    neighborhood = request.get('neighborhood', 'random')
+    if neighborhood not in NEIGHBORHOODS:
+        raise ValueError(f"Vecindad '{neighborhood}' no válida. Opciones: {', '.join(NEIGHBORHOODS)}")
+
+    return problem.grid.tolist(), cooling, budget, neighborhood, as_string
+
+class Job:
+    def __init__(self, request_id, grid, cooling, budget, neighborhood, as_string, reply):
+        self.request_id = request_id
+        self.grid = grid
+        self.cooling = cooling
+        self.budget = budget
+        self.neighborhood = neighborhood
+        self.as_string = as_string
+        self.reply = reply                  # Corrutina que escribe la respuesta a su cliente
+        self.received = time.perf_counter()
+        self.done = asyncio.get_running_loop().create_future()
+
+class SolveServer:
+    def __init__(self, workers=None, queue_size=64, cache_path=None, cache_max=10000):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.cache_max = cache_max
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.pool = None
+        self._pool_lock = asyncio.Lock()
+        self._dispatchers = []
+
+    async def _new_pool(self):
+        loop = asyncio.get_running_loop()
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker,
+                                   initargs=(self.cache_path, self.cache_max))
+        # Arranca todos los procesos de inmediato en lugar de esperar a la primera petición
+        await asyncio.gather(*(loop.run_in_executor(pool, _ping) for _ in range(self.workers)))
+        return pool
+
+    async def _rebuild_pool(self, broken):
+        '''
+        Reemplaza un pool que quedó inservible (un proceso murió). Varios
+        despachadores pueden notarlo a la vez; con el candado solo el primero
+        lo reconstruye y los demás usan el nuevo.
+        '''
+        async with self._pool_lock:
+            if self.pool is broken:
+                print("Un proceso del pool terminó de forma abrupta; se reconstruye el pool", file=sys.stderr)
+                broken.shutdown(wait=False)
+                self.pool = await self._new_pool()
+
+    async def _run_job(self, job):
+        # Si el pool se rompe durante el trabajo, se reconstruye y se reintenta una sola vez
+        loop = asyncio.get_running_loop()
+        pool = self.pool
+        try:
+            return await loop.run_in_executor(pool, _solve_job, job.grid, job.cooling, job.budget, job.neighborhood)
+        except BrokenProcessPool:
+            await self._rebuild_pool(pool)
+            return await loop.run_in_executor(self.pool, _solve_job, job.grid, job.cooling, job.budget,
+                                              job.neighborhood)
+
+    async def start(self):
+        self.pool = await self._new_pool()
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self.pool.shutdown()
+
+    async def _dispatch(self):
+        while True:
+            job = await self.queue.get()
+            started = time.perf_counter()
+            try:
+                grid, fitness, solve_time, cached = await self._run_job(job)
+                finished = time.perf_counter()
+                if job.as_string:
+                    solution = ''.join(str(x) for row in grid for x in row)
+                else:
+                    solution = grid
+                response = {
+                    'id': job.request_id,
+                    'ok': True,
+                    'fitness': fitness,
+                    'solved': fitness == 0,
+                    'solution': solution,
+                    'cached': cached,
+                    'queue_ms': round((started - job.received) * 1000, 3),
+                    'solve_ms': round(solve_time * 1000, 3),
+                    'total_ms': round((finished - job.received) * 1000, 3),
+                }
+            except Exception as e:
+                response = {'id': job.request_id, 'ok': False, 'error': str(e)}
+            try:
+                await job.reply(response)
+            except Exception as e:
+                # El cliente se fue antes de recibir su respuesta: se descarta y el
+                # despachador vuelve a la cola en lugar de morir
+                print(f"No se pudo responder la petición {job.request_id!r}: {e}", file=sys.stderr)
+            finally:
+                job.done.set_result(None)
+                self.queue.task_done()
+
+    async def handle(self, reader, reply):
+        '''
+        Atiende un flujo de peticiones. Cuando la cola está llena, queue.put
+        se bloquea y se deja de leer del cliente (backpressure) hasta que un
+        proceso quede libre.
+        '''
+        pending = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            request_id = None
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("La petición debe ser un objeto JSON")
+                request_id = request.get('id')
+                grid, cooling, budget, neighborhood, as_string = parse_request(request)
+            except Exception as e:
+                await reply({'id': request_id, 'ok': False, 'error': f"Petición inválida: {e}"})
+                continue
+            job = Job(request_id, grid, cooling, budget, neighborhood, as_string, reply)
+            await self.queue.put(job)
+            pending.append(job.done)
+            pending = [f for f in pending if not f.done()]
+
+        # Fin de la entrada: espera las respuestas pendientes de este cliente
+        if pending:
+            await asyncio.gather(*pending)
+
+async def serve_stdio(server):
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+
+    async def reply(response):
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+    await server.handle(reader, reply)
+
+async def serve_unix(server, path):
+    async def client(reader, writer):
+        lock = asyncio.Lock()
+
+        async def reply(response):
+            # Si el cliente ya cerró o reinició la conexión, su respuesta se descarta
+            if writer.is_closing():
+                return
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        try:
+            await server.handle(reader, reply)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    if os.path.exists(path):
+        os.remove(path)
+    unix_server = await asyncio.start_unix_server(client, path=path)
+    print(f"Escuchando en {path} con {server.workers} procesos", file=sys.stderr)
+    async with unix_server:
+        await unix_server.serve_forever()
+
+async def run(args):
+    server = SolveServer(workers=args.workers, queue_size=args.queue, cache_path=args.cache,
+                         cache_max=args.cache_max)
+    await server.start()
+    try:
+        if args.socket is not None:
+            await serve_unix(server, args.socket)
+        else:
+            await serve_stdio(server)
+    finally:
+        await server.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor de resolución de Sudokus (JSON-lines)")
+    parser.add_argument('--socket', default=None,
+                        help="ruta del socket Unix; sin esta opción se usa stdin/stdout")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="número de procesos de resolución (por defecto, núm. de CPUs)")
+    parser.add_argument('--queue', type=int, default=64,
+                        help="tamaño máximo de la cola; al llenarse se deja de leer entrada")
+    parser.add_argument('--cache', default=None, metavar='ARCHIVO',
+                        help="caché persistente de tableros resueltos compartida por los procesos")
+    parser.add_argument('--cache-max', type=int, default=10000,
+                        help="entradas máximas de la caché (por defecto 10000)")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
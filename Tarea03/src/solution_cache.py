@@ -0,0 +1,55 @@
+import os
+import time
+import sqlite3
+
+class SolutionCache:
+    '''
+    Caché persistente de Sudokus resueltos, indexada por la forma canónica
+    del tablero (Sudoku.canonicalize). Guarda la solución en el marco
+    canónico, así que sirve para cualquier tablero isomorfo al original.
+
+    Vive en un archivo SQLite, por lo que varios procesos pueden compartirla.
+    El tamaño está acotado por max_entries: al rebasarlo se eliminan las
+    entradas usadas hace más tiempo (LRU).
+    '''
+    def __init__(self, path, max_entries=10000):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser mayor que 0")
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30)
+        with self._conn:
+            self._conn.execute("CREATE TABLE IF NOT EXISTS solutions ("
+                               "key TEXT PRIMARY KEY, solution TEXT NOT NULL, last_used INTEGER NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+
+    def get(self, key):
+        # Regresa la solución canónica (cadena) o None; un acierto la marca como recién usada
+        row = self._conn.execute("SELECT solution FROM solutions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        with self._conn:
+            self._conn.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time_ns(), key))
+        self.hits += 1
+        return row[0]
+
+    def put(self, key, solution):
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO solutions (key, solution, last_used) VALUES (?, ?, ?)",
+                               (key, solution, time.time_ns()))
+            # Desalojo LRU: conserva solo las max_entries más recientes
+            self._conn.execute("DELETE FROM solutions WHERE key IN ("
+                               "SELECT key FROM solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                               (self.max_entries,))
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
@@ -6,6 +6,19 @@ from collections import Counter
 import time
 import os
 import sys
+import pickle
+import argparse
+import itertools
+import functools
+from profiler import PhaseProfiler, run_with_cprofile
+from solution_cache import SolutionCache
+
+CHECKPOINT_VERSION = 1
+SA_PHASES = ('vecino', 'evaluacion', 'aceptacion', 'bookkeeping')
+NEIGHBORHOODS = ('random', 'conflicts', 'min_conflicts')
+# Límites de la búsqueda de canonicalize(): candidatos empatados y ramas vivas por paso
+CANONICAL_MAX_TIES = 20000
+CANONICAL_MAX_BRANCHES = 64
 
 class Sudoku:
     def __init__(self, grid):
@@ -30,9 +43,287 @@ class Sudoku:
 
         return cls(grid)
 
+    @classmethod
+    def from_string(cls, text):
+        # Tablero en una sola cadena de n*n caracteres; '0' o '.' son celdas vacías
+        cells = [c for c in text if not c.isspace()]
+        size = int(math.sqrt(len(cells)))
+        if size * size != len(cells):
+            raise ValueError(f"Una cadena de {len(cells)} caracteres no forma un tablero cuadrado")
+
+        values = []
+        for c in cells:
+            if c == '.':
+                values.append(0)
+            elif c.isdigit():
+                values.append(int(c))
+            else:
+                raise ValueError(f"Carácter inválido en el tablero: '{c}'")
+
+        grid = [values[i * size:(i + 1) * size] for i in range(size)]
+        return cls(grid)
+
+    def cell_units(self, row, col):
+        # Índices de las unidades de la celda: fila (0..n-1), columna (n..2n-1) y bloque (2n..3n-1)
+        block = (row // self.block_size) * self.block_size + col // self.block_size
+        return (row, self.size + col, 2 * self.size + block)
+
+    def canonicalize(self):
+        '''
+        Forma canónica del tablero bajo las simetrías que preservan Sudokus:
+        transposición, intercambio de bandas y de pilas, permutación de filas
+        dentro de su banda y de columnas dentro de su pila, y reetiquetado de
+        dígitos. El representante es el tablero lexicográficamente mínimo de
+        la órbita, con los dígitos numerados en orden de primera aparición.
+
+        Regresa (llave, transformación), donde transformación es
+        (transpuesta, filas, columnas, etiquetas) y se aplica con
+        apply_transform / invert_transform. Dos tableros isomorfos producen
+        la misma llave.
+
+        Para bloques mayores a 3x3 el número de órdenes de columnas crece
+        demasiado; en ese caso solo se reetiquetan los dígitos (la llave sigue
+        detectando tableros repetidos, pero no isomorfos). Lo mismo pasa con
+        tableros muy vacíos o simétricos: si en algún paso quedan más de
+        CANONICAL_MAX_TIES candidatos empatados o más de CANONICAL_MAX_BRANCHES
+        ramas, la búsqueda se abandona y se usa la llave con solo reetiquetado,
+        para que el costo quede acotado (los ejemplares reales no pasan de
+        unos cientos de empates y 8 ramas).
+        '''
+        n, k = self.size, self.block_size
+        if k > 3:
+            return self._relabel_key()
+
+        col_orders = _block_orders(k)
+        m = len(col_orders)
+
+        # Cada rama: (transpuesta, filas elegidas, órdenes de columnas empatados, etiquetas, siguiente etiqueta)
+        branches = []
+        for transposed in (False, True):
+            branches.append((transposed, [], col_orders,
+                             np.zeros((m, n + 1), dtype=int), np.ones(m, dtype=int)))
+
+        weights = (n + 1) ** np.arange(n - 1, -1, -1)
+        # El tablero canónico se construye fila por fila: en cada paso se
+        # conservan solo las ramas cuya siguiente fila es la mínima posible
+        for i in range(n):
+            candidates = []
+            best = None
+            for transposed, rows, orders, labels, next_label in branches:
+                grid = self.grid.T if transposed else self.grid
+                if i % k == 0:
+                    used_bands = {r // k for r in rows}
+                    options = [r for r in range(n) if r // k not in used_bands]
+                else:
+                    band = rows[-1] // k
+                    options = [r for r in range(band * k, band * k + k) if r not in rows]
+
+                for r in options:
+                    values = grid[r][orders]
+                    new_labels = labels.copy()
+                    new_next = next_label.copy()
+                    lanes = np.arange(len(orders))
+                    relabeled = np.empty_like(values)
+                    for j in range(n):
+                        v = values[:, j]
+                        fresh = (v != 0) & (new_labels[lanes, v] == 0)
+                        new_labels[lanes[fresh], v[fresh]] = new_next[fresh]
+                        new_next += fresh
+                        relabeled[:, j] = new_labels[lanes, v]
+
+                    row_keys = relabeled @ weights
+                    row_min = row_keys.min()
+                    if best is None or row_min < best:
+                        best = row_min
+                    candidates.append((row_min, transposed, rows + [r], orders, new_labels, new_next, row_keys))
+
+            branches = []
+            ties = 0
+            for row_min, transposed, rows, orders, labels, next_label, row_keys in candidates:
+                if row_min == best:
+                    keep = row_keys == best
+                    ties += int(keep.sum())
+                    branches.append((transposed, rows, orders[keep], labels[keep], next_label[keep]))
+            # Demasiados empates (tablero casi vacío o muy simétrico): la
+            # búsqueda exacta crecería mucho, se usa la llave sin permutaciones
+            if ties > CANONICAL_MAX_TIES or len(branches) > CANONICAL_MAX_BRANCHES:
+                return self._relabel_key()
+
+        # Todas las ramas restantes dan el mismo tablero; se toma la primera
+        transposed, rows, orders, labels, next_label = branches[0]
+        labels = labels[0].copy()
+        label = next_label[0]
+        for digit in range(1, n + 1):
+            # Dígitos ausentes del tablero: cualquier etiqueta libre sirve
+            if labels[digit] == 0:
+                labels[digit] = label
+                label += 1
+
+        transform = (bool(transposed), list(rows), orders[0].tolist(), labels.tolist())
+        return _grid_key(self.apply_transform(self.grid, transform)), transform
+
+    def _relabel_key(self):
+        # Llave con solo reetiquetado de dígitos: reconoce tableros repetidos, no isomorfos
+        n = self.size
+        transform = (False, list(range(n)), list(range(n)), _complete_labels(self.grid.ravel(), n))
+        return _grid_key(self.apply_transform(self.grid, transform)), transform
+
+    @staticmethod
+    def apply_transform(grid, transform):
+        # Lleva un tablero (o su solución) al marco canónico
+        transposed, rows, cols, labels = transform
+        grid = np.asarray(grid)
+        if transposed:
+            grid = grid.T
+        return np.asarray(labels)[grid[np.ix_(rows, cols)]]
+
+    @staticmethod
+    def invert_transform(grid, transform):
+        # Regresa un tablero del marco canónico al marco original
+        transposed, rows, cols, labels = transform
+        inverse = np.zeros(len(labels), dtype=int)
+        inverse[labels] = np.arange(len(labels))
+        result = np.empty_like(np.asarray(grid))
+        result[np.ix_(rows, cols)] = inverse[np.asarray(grid)]
+        return result.T if transposed else result
+
     def __str__(self):
         return str(self.grid)
 
+@functools.lru_cache(maxsize=None)
+def _block_orders(k):
+    # Todos los órdenes de filas (o columnas) que respetan bandas: permutación
+    # de bandas y permutación dentro de cada banda. Para k=3 son 6^4 = 1296
+    orders = []
+    for bands in itertools.permutations(range(k)):
+        for inner in itertools.product(itertools.permutations(range(k)), repeat=k):
+            orders.append([b * k + inner[pos][j] for pos, b in enumerate(bands) for j in range(k)])
+    return np.array(orders, dtype=int)
+
+def _complete_labels(values, n):
+    # Etiquetas en orden de primera aparición; los dígitos ausentes van al final
+    labels = [0] * (n + 1)
+    label = 1
+    for v in list(values) + list(range(1, n + 1)):
+        if v != 0 and labels[v] == 0:
+            labels[v] = label
+            label += 1
+    return labels
+
+def _grid_key(grid):
+    # Cadena del tablero en orden de filas; con n > 9 los valores se separan con comas
+    values = [str(x) for x in np.asarray(grid).ravel()]
+    return ''.join(values) if len(grid) <= 9 else ','.join(values)
+
+def _parse_grid_key(key, n):
+    values = [int(x) for x in key.split(',')] if n > 9 else [int(c) for c in key]
+    return np.array(values, dtype=int).reshape(n, n)
+
+class ConflictIndex:
+    '''
+    Conteo de cada valor por unidad (filas, columnas y bloques), número total
+    de conflictos y conjunto de celdas vacías en conflicto. Se actualiza de
+    forma incremental en cada intercambio: solo se revisan las celdas de las
+    unidades tocadas que tienen alguno de los dos valores intercambiados.
+    '''
+    def __init__(self, solution):
+        problem = solution.problem
+        n = problem.size
+
+        # Unidades de cada celda vacía y celdas vacías de cada unidad (no cambian)
+        self.cell_units = [problem.cell_units(row, col) for row, col in solution.empty_positions]
+        self.unit_empty = [[] for _ in range(3 * n)]
+        for idx, units in enumerate(self.cell_units):
+            for unit in units:
+                self.unit_empty[unit].append(idx)
+
+        self.counts = [[0] * (n + 1) for _ in range(3 * n)]
+        for row in range(n):
+            for col in range(n):
+                value = int(solution.get_value(row, col))
+                for unit in problem.cell_units(row, col):
+                    self.counts[unit][value] += 1
+        self.total = sum(max(0, count - 1) for unit_counts in self.counts for count in unit_counts)
+
+        # Lista + posición de cada celda en la lista: alta, baja y elección aleatoria en O(1)
+        self.conflicted = []
+        self.position = {}
+        for idx, value in enumerate(solution.values):
+            self._refresh(idx, value)
+
+    def copy(self):
+        new = ConflictIndex.__new__(ConflictIndex)
+        new.cell_units = self.cell_units
+        new.unit_empty = self.unit_empty
+        new.counts = [unit_counts[:] for unit_counts in self.counts]
+        new.total = self.total
+        new.conflicted = self.conflicted.copy()
+        new.position = self.position.copy()
+        return new
+
+    def set_order(self, conflicted):
+        # Restaura el orden de la lista (necesario para reanudar checkpoints de forma idéntica)
+        if set(conflicted) != set(self.conflicted):
+            raise ValueError("El conjunto de celdas en conflicto no coincide con el tablero")
+        self.conflicted = list(conflicted)
+        self.position = {idx: pos for pos, idx in enumerate(self.conflicted)}
+
+    def _is_conflicted(self, idx, value):
+        counts = self.counts
+        return any(counts[unit][value] > 1 for unit in self.cell_units[idx])
+
+    def _refresh(self, idx, value):
+        conflicted = self._is_conflicted(idx, value)
+        if conflicted and idx not in self.position:
+            self.position[idx] = len(self.conflicted)
+            self.conflicted.append(idx)
+        elif not conflicted and idx in self.position:
+            pos = self.position.pop(idx)
+            last = self.conflicted.pop()
+            if last != idx:
+                self.conflicted[pos] = last
+                self.position[last] = pos
+
+    def _move(self, idx, old, new):
+        # Cambia el valor de una celda en los conteos, actualizando el total de conflictos
+        for unit in self.cell_units[idx]:
+            counts = self.counts[unit]
+            if counts[old] > 1:
+                self.total -= 1
+            counts[old] -= 1
+            if counts[new] >= 1:
+                self.total += 1
+            counts[new] += 1
+
+    def swap_delta(self, values, idx1, idx2):
+        # Cambio en el total de conflictos si se intercambian idx1 e idx2 (sin aplicarlo)
+        v1, v2 = values[idx1], values[idx2]
+        if v1 == v2:
+            return 0
+        before = self.total
+        self._move(idx1, v1, v2)
+        self._move(idx2, v2, v1)
+        delta = self.total - before
+        self._move(idx2, v1, v2)
+        self._move(idx1, v2, v1)
+        return delta
+
+    def apply_swap(self, values, idx1, idx2):
+        # `values` ya tiene el intercambio aplicado
+        new1, new2 = values[idx1], values[idx2]
+        if new1 == new2:
+            return
+        self._move(idx1, new2, new1)
+        self._move(idx2, new1, new2)
+
+        touched = set()
+        for unit in self.cell_units[idx1] + self.cell_units[idx2]:
+            touched.update(self.unit_empty[unit])
+        for idx in touched:
+            value = values[idx]
+            if value == new1 or value == new2:
+                self._refresh(idx, value)
+
 class SudokuSolution:
     def __init__(self, problem, values=None):
         self.problem = problem
@@ -53,6 +344,8 @@ class SudokuSolution:
         else:
             self.values = self._generate_random_solution()
 
+        self._index = None          # ConflictIndex, se construye solo si se necesita
+
     def _generate_random_solution(self):
         n = self.problem.size
 
@@ -113,7 +406,16 @@ class SudokuSolution:
 
         return grid
 
+    def conflict_index(self):
+        if self._index is None:
+            self._index = ConflictIndex(self)
+        return self._index
+
     def evaluate(self):
+        # Con el índice de conflictos el total ya está calculado
+        if self._index is not None:
+            return float(self._index.total)
+
         n = self.problem.size
         k = self.problem.block_size
         total_conflicts = 0
@@ -141,19 +443,72 @@ class SudokuSolution:
         return sum(max(0, count - 1) for count in freq.values())
 
     def copy(self):
-        return SudokuSolution(self.problem, self.values.copy())
-
-
-    def get_neighbor(self):
+        # Las posiciones vacías solo dependen del problema, así que se comparten
+        new = SudokuSolution.__new__(SudokuSolution)
+        new.problem = self.problem
+        new.empty_positions = self.empty_positions
+        new.num_empty = self.num_empty
+        new.position_to_index = self.position_to_index
+        new.values = self.values.copy()
+        new._index = None if self._index is None else self._index.copy()
+        return new
+
+    def swap(self, idx1, idx2):
+        self.values[idx1], self.values[idx2] = self.values[idx2], self.values[idx1]
+        if self._index is not None:
+            self._index.apply_swap(self.values, idx1, idx2)
+
+    def get_neighbor(self, mode='random'):
+        '''
+        Intercambia los valores de dos celdas vacías. Modos:
+          random        ambas celdas al azar
+          conflicts     una celda al azar entre las que están en conflicto, la otra al azar
+          min_conflicts una celda en conflicto y como pareja la que deja menos conflictos
+        '''
         if self.num_empty < 2:
             return self.copy()
+
+        if mode == 'random':
+            idx1, idx2 = random.sample(range(self.num_empty), 2)
+        elif mode in NEIGHBORHOODS:
+            index = self.conflict_index()
+            if not index.conflicted:
+                idx1, idx2 = random.sample(range(self.num_empty), 2)
+            else:
+                idx1 = random.choice(index.conflicted)
+                if mode == 'conflicts':
+                    idx2 = random.randrange(self.num_empty - 1)
+                    if idx2 >= idx1:
+                        idx2 += 1
+                else:
+                    idx2 = self._min_conflicts_partner(index, idx1)
+        else:
+            raise ValueError(f"Vecindad '{mode}' no válida. Opciones: {', '.join(NEIGHBORHOODS)}")
+
         # Crear copia de la solución actual
         neighbor = self.copy()
-        idx1, idx2 = random.sample(range(self.num_empty), 2)
-
-        neighbor.values[idx1], neighbor.values[idx2] = neighbor.values[idx2], neighbor.values[idx1]
+        neighbor.swap(idx1, idx2)
         return neighbor
 
+    def _min_conflicts_partner(self, index, idx1):
+        best_delta = None
+        candidates = []
+        for idx2 in range(self.num_empty):
+            if idx2 == idx1 or self.values[idx2] == self.values[idx1]:
+                continue
+            delta = index.swap_delta(self.values, idx1, idx2)
+            if best_delta is None or delta < best_delta:
+                best_delta = delta
+                candidates = [idx2]
+            elif delta == best_delta:
+                candidates.append(idx2)
+
+        if not candidates:
+            idx2 = random.randrange(self.num_empty - 1)
+            return idx2 + 1 if idx2 >= idx1 else idx2
+        # Desempate aleatorio para no ciclar entre las mismas parejas
+        return random.choice(candidates)
+
 def geometric_cooling(current_temperature, alpha):
     return alpha * current_temperature
 
@@ -164,25 +519,82 @@ def linear_cooling(current_temperature, beta):
     new_temp = current_temperature - beta
     return max(new_temp, 1e-4)  # Evita temperatura negativa
 
-def simulated_annealing(problem, initial_temp=100.0, alpha=0.0005, N0_factor = 2, p=1.15, max_iteration = 250000, cooling='l'):
+def save_checkpoint(filename, state):
+    # Escritura atómica: se escribe a un temporal y se reemplaza, así un proceso
+    # interrumpido nunca deja un checkpoint a medias
+    tmp_filename = filename + '.tmp'
+    with open(tmp_filename, 'wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_filename, filename)
+
+def load_checkpoint(filename):
+    with open(filename, 'rb') as f:
+        state = pickle.load(f)
+    if state.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Versión de checkpoint no soportada en '{filename}'")
+    return state
+
+def simulated_annealing(problem, initial_temp=100.0, alpha=0.0005, N0_factor = 2, p=1.15, max_iteration = 250000, cooling='l',
+                        checkpoint_file=None, checkpoint_interval=10000, state=None, profiler=None, verbose=True,
+                        neighborhood='random'):
     # Inicialización
-    current_solution = SudokuSolution(problem)
-    current_fitness = current_solution.evaluate()
-    best_solution = current_solution.copy()
-    best_fitness = current_fitness
-
-    N = int(N0_factor * problem.size)
-    temperature = initial_temp
-    iteration = 0
-
-    print(f"N {N}")
-    print(f"Temperatura inicial: {temperature}")
-    # Ciclo principal
-    while temperature > 1e-4 and best_fitness > 0 and iteration < max_iteration:
-        for _ in range(N):
+    if state is None:
+        current_solution = SudokuSolution(problem)
+        current_fitness = current_solution.evaluate()
+        best_solution = current_solution.copy()
+        best_fitness = current_fitness
+
+        N = int(N0_factor * problem.size)
+        temperature = initial_temp
+        iteration = 0
+        step = 0            # Posición dentro del ciclo interno de N pasos
+    else:
+        # Reanudar desde un checkpoint: se restaura el estado completo, incluido el RNG
+        initial_temp = state['initial_temp']
+        alpha = state['alpha']
+        p = state['p']
+        max_iteration = state['max_iteration']
+        cooling = state['cooling']
+        neighborhood = state.get('neighborhood', 'random')
+        current_solution = SudokuSolution(problem, state['current_values'])
+        if state.get('current_conflicted') is not None:
+            current_solution.conflict_index().set_order(state['current_conflicted'])
+        current_fitness = state['current_fitness']
+        best_solution = SudokuSolution(problem, state['best_values'])
+        best_fitness = state['best_fitness']
+        N = state['N']
+        temperature = state['temperature']
+        iteration = state['iteration']
+        step = state['step']
+        random.setstate(state['rng_state'])
+
+    if verbose:
+        print(f"N {N}")
+        print(f"Temperatura inicial: {temperature}")
+    # Ciclo principal. Al reanudar, el checkpoint pudo tomarse a la mitad de un
+    # ciclo interno, por lo que se termina ese ciclo antes de revisar la condición
+    resuming = state is not None
+    start_iteration = iteration
+    accepted = 0
+    if profiler is not None:
+        profiler.start()
+    while resuming or (temperature > 1e-4 and best_fitness > 0 and iteration < max_iteration):
+        resuming = False
+        for step in range(step, N):
+            # En modo perfil solo se mide una de cada sample_every iteraciones
+            timed = profiler is not None and profiler.sample()
+            if timed:
+                t0 = time.perf_counter_ns()
+
             # Generar vecino
-            neighbor = current_solution.get_neighbor()
+            neighbor = current_solution.get_neighbor(neighborhood)
+            if timed:
+                t1 = time.perf_counter_ns()
             neighbor_fitness = neighbor.evaluate()
+            if timed:
+                t2 = time.perf_counter_ns()
 
             delta_fitness = neighbor_fitness - current_fitness
             if delta_fitness <= 0:
@@ -190,9 +602,12 @@ def simulated_annealing(problem, initial_temp=100.0, alpha=0.0005, N0_factor = 2
             else:
                 probability = math.exp(-delta_fitness / temperature)
                 accept = random.random() < probability
+            if timed:
+                t3 = time.perf_counter_ns()
 
             # Actualizar solución actual
             if accept:
+                accepted += 1
                 current_solution = neighbor
                 current_fitness = neighbor_fitness
 
@@ -201,11 +616,42 @@ def simulated_annealing(problem, initial_temp=100.0, alpha=0.0005, N0_factor = 2
                     best_solution = current_solution.copy()
                     best_fitness = current_fitness
 
-            print("Data")
-            print(best_fitness)
-            print(iteration)
-            print(temperature)
+            if verbose:
+                print("Data")
+                print(best_fitness)
+                print(iteration)
+                print(temperature)
             iteration += 1
+
+            if checkpoint_file is not None and iteration % checkpoint_interval == 0:
+                save_checkpoint(checkpoint_file, {
+                    'version': CHECKPOINT_VERSION,
+                    'grid': problem.grid,
+                    'initial_temp': initial_temp,
+                    'alpha': alpha,
+                    'p': p,
+                    'max_iteration': max_iteration,
+                    'cooling': cooling,
+                    'neighborhood': neighborhood,
+                    'current_conflicted': None if current_solution._index is None else current_solution._index.conflicted,
+                    'current_values': current_solution.values,
+                    'current_fitness': current_fitness,
+                    'best_values': best_solution.values,
+                    'best_fitness': best_fitness,
+                    'N': N,
+                    'temperature': temperature,
+                    'iteration': iteration,
+                    'step': step + 1,
+                    'rng_state': random.getstate(),
+                })
+
+            if timed:
+                t4 = time.perf_counter_ns()
+                profiler.record('vecino', t1 - t0)
+                profiler.record('evaluacion', t2 - t1)
+                profiler.record('aceptacion', t3 - t2)
+                profiler.record('bookkeeping', t4 - t3)
+        step = 0
         if cooling== 'g':
             alpha = 0.88        # Alpha customizada para geometric
             temperature = geometric_cooling(temperature, alpha)
@@ -218,44 +664,178 @@ def simulated_annealing(problem, initial_temp=100.0, alpha=0.0005, N0_factor = 2
             beta = initial_temp/max_iteration  # Como es lineal, se emplea beta calculada de la temperatura inicial y max_iteration
             temperature = linear_cooling(initial_temp, beta * iteration)
 
-    print(f"Iteraciones: {iteration}")
+    if profiler is not None:
+        profiler.stop()
+        proposals = iteration - start_iteration
+        for phase in profiler.phases:
+            profiler.add_calls(phase, proposals)
+        profiler.count('propuestas', proposals)
+        profiler.count('evaluaciones', proposals)
+        profiler.count('aceptadas', accepted)
+
+    # La corrida terminó, el checkpoint ya no es necesario
+    if checkpoint_file is not None and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+
+    if verbose:
+        print(f"Iteraciones: {iteration}")
     return best_solution, best_fitness
 
-def solve_sudoku_from_file(filename, cooling_method='s', alpha=0.85): # Si no se especifica un enfriamiento, usa el método lento por defecto
+def cached_solution(problem, cache, key, transform):
+    # Busca la forma canónica en la caché y la regresa al marco del tablero; None si no está
+    canonical = cache.get(key)
+    if canonical is None:
+        return None
+
+    grid = Sudoku.invert_transform(_parse_grid_key(canonical, problem.size), transform)
+    # Mismo orden (por filas) que SudokuSolution.empty_positions; así no se genera un llenado aleatorio
+    values = [int(v) for v in grid[~problem.fixed_cells]]
+    solution = SudokuSolution(problem, values)
+    # Una entrada que no resuelve el tablero (archivo alterado) se trata como fallo
+    if not (grid[problem.fixed_cells] == problem.grid[problem.fixed_cells]).all() or solution.evaluate() != 0:
+        return None
+    return solution
+
+def solve_sudoku(problem, cooling_method='s', alpha=0.85, max_iteration=250000, checkpoint_file=None,
+                 checkpoint_interval=10000, profiler=None, verbose=True, neighborhood='random', cache=None):
+    '''
+    Regresa (mejor_solución, fitness, desde_cache); desde_cache indica que la
+    solución salió de la caché y no se ejecutó el recocido.
+    '''
+    if cache is not None:
+        key, transform = problem.canonicalize()
+        solution = cached_solution(problem, cache, key, transform)
+        if solution is not None:
+            if verbose:
+                print("Solución encontrada en la caché, se omite el recocido")
+                print("Iteraciones: 0")
+            return solution, 0.0, True
+
+    # Calcular temperatura inicial basada en el problema
+    sample_solution = SudokuSolution(problem)
+    initial_fitness = sample_solution.evaluate()
+    initial_temp = initial_fitness * 0.5
+
+    # Ejecutar recocido simulado
+    best_solution, best_fitness = simulated_annealing(
+        problem=problem,
+        initial_temp=initial_temp,
+        alpha=alpha,
+        max_iteration=max_iteration,
+        cooling=cooling_method,
+        checkpoint_file=checkpoint_file,
+        checkpoint_interval=checkpoint_interval,
+        profiler=profiler,
+        verbose=verbose,
+        neighborhood=neighborhood
+    )
+
+    # Solo se guardan tableros resueltos, en el marco canónico
+    if cache is not None and best_fitness == 0:
+        cache.put(key, _grid_key(Sudoku.apply_transform(best_solution.get_grid(), transform)))
+    return best_solution, best_fitness, False
+
+def solve_sudoku_from_file(filename, cooling_method='s', alpha=0.85, checkpoint_file=None, checkpoint_interval=10000, profiler=None,
+                           neighborhood='random', cache=None): # Si no se especifica un enfriamiento, usa el método lento por defecto
     if not os.path.exists(filename):
         raise FileNotFoundError(f"El archivo '{filename}' no fue encontrado")
     try:
         problem = Sudoku.from_file(filename)
 
-        # Calcular temperatura inicial basada en el problema
-        sample_solution = SudokuSolution(problem)
-        initial_fitness = sample_solution.evaluate()
-        initial_temp = initial_fitness * 0.5
+        best_solution, best_fitness, from_cache = solve_sudoku(
+            problem,
+            cooling_method=cooling_method,
+            alpha=alpha,
+            checkpoint_file=checkpoint_file,
+            checkpoint_interval=checkpoint_interval,
+            profiler=profiler,
+            neighborhood=neighborhood,
+            cache=cache
+        )
+        return best_solution
+
+    except Exception as e:
+        raise ValueError(f"Error al procesar el archivo '{filename}': {str(e)}")
+
+def resume_sudoku_from_checkpoint(checkpoint_file, checkpoint_interval=10000, profiler=None):
+    if not os.path.exists(checkpoint_file):
+        raise FileNotFoundError(f"El checkpoint '{checkpoint_file}' no fue encontrado")
+    try:
+        state = load_checkpoint(checkpoint_file)
+        problem = Sudoku(state['grid'])
 
-        # Ejecutar recocido simulado
+        # Continúa la corrida exactamente donde se quedó
         best_solution, best_fitness = simulated_annealing(
             problem=problem,
-            initial_temp=initial_temp,
-            alpha=alpha,
-            cooling=cooling_method
+            checkpoint_file=checkpoint_file,
+            checkpoint_interval=checkpoint_interval,
+            state=state,
+            profiler=profiler
         )
         return best_solution
 
     except Exception as e:
-        raise ValueError(f"Error al procesar el archivo '{filename}': {str(e)}")
+        raise ValueError(f"Error al reanudar desde '{checkpoint_file}': {str(e)}")
+
+def parse_arguments(args):
+    parser = argparse.ArgumentParser(
+        usage="python sudoku.py archivo.txt metodo_enfriamiento [opciones]\n"
+              "       python sudoku.py --reanudar checkpoint.ckpt",
+        description="Métodos: g (geometric), s (slow), l (linear)")
+    parser.add_argument('filename', nargs='?', help="archivo con el tablero")
+    parser.add_argument('cooling_method', nargs='?', help="método de enfriamiento (g, s, l)")
+    parser.add_argument('--checkpoint', default=None,
+                        help="archivo donde se guarda periódicamente el estado de la búsqueda")
+    parser.add_argument('--intervalo', type=int, default=10000,
+                        help="iteraciones entre checkpoints (por defecto 10000)")
+    parser.add_argument('--reanudar', default=None, metavar='CHECKPOINT',
+                        help="continúa una corrida desde su checkpoint")
+    parser.add_argument('--vecindad', default='random', choices=NEIGHBORHOODS,
+                        help="selección de las celdas a intercambiar (por defecto random)")
+    parser.add_argument('--cache', default=None, metavar='ARCHIVO',
+                        help="caché persistente de tableros resueltos (también reconoce tableros isomorfos)")
+    parser.add_argument('--cache-max', type=int, default=10000,
+                        help="entradas máximas de la caché; se desalojan las menos usadas (por defecto 10000)")
+    parser.add_argument('--profile', action='store_true',
+                        help="mide el tiempo por fase del recocido e imprime un desglose al final")
+    parser.add_argument('--prof-file', default=None, metavar='ARCHIVO.prof',
+                        help="envuelve la corrida en cProfile y guarda las estadísticas")
+    parsed = parser.parse_args(args)
+
+    if parsed.reanudar is None and (parsed.filename is None or parsed.cooling_method is None):
+        parser.print_usage()
+        sys.exit(1)
+    if parsed.intervalo < 1:
+        parser.error("--intervalo debe ser mayor que 0")
+    if parsed.cache_max < 1:
+        parser.error("--cache-max debe ser mayor que 0")
+    return parsed
 
 def main():
-    if len(sys.argv) != 3:
-        print("Uso: python sudoku.py archivo.txt metodo_enfriamiento")
-        print("Métodos: g (geometric), s (slow), l (linear)")
-        sys.exit(1)
+    args = parse_arguments(sys.argv[1:])
 
-    filename = sys.argv[1]
-    cooling_method = sys.argv[2]
+    profiler = PhaseProfiler(SA_PHASES) if args.profile else None
 
     try:
-        print(f"Resolviendo sudoku desde: {filename} con método {cooling_method}")
-        solution = solve_sudoku_from_file(filename, cooling_method=cooling_method)
+        if args.reanudar is not None:
+            print(f"Reanudando desde: {args.reanudar}")
+            solve = resume_sudoku_from_checkpoint
+            solve_args = (args.reanudar,)
+            solve_kwargs = {'checkpoint_interval': args.intervalo, 'profiler': profiler}
+        else:
+            print(f"Resolviendo sudoku desde: {args.filename} con método {args.cooling_method}")
+            solve = solve_sudoku_from_file
+            solve_args = (args.filename,)
+            solve_kwargs = {'cooling_method': args.cooling_method, 'checkpoint_file': args.checkpoint,
+                            'checkpoint_interval': args.intervalo, 'profiler': profiler,
+                            'neighborhood': args.vecindad}
+            if args.cache is not None:
+                solve_kwargs['cache'] = SolutionCache(args.cache, max_entries=args.cache_max)
+
+        if args.prof_file is not None:
+            solution = run_with_cprofile(args.prof_file, solve, *solve_args, **solve_kwargs)
+        else:
+            solution = solve(*solve_args, **solve_kwargs)
 
         fitness = solution.evaluate()
         print(f"\nResultados:")
@@ -271,6 +851,9 @@ def main():
         for row in grid:
             print(' '.join(f'{x:2d}' for x in row))
 
+        if profiler is not None:
+            profiler.report("Perfil del recocido simulado")
+
     except (FileNotFoundError, ValueError) as e:
         print(f"Error: {e}")
         sys.exit(1)